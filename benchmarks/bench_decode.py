@@ -0,0 +1,76 @@
+"""Decoding benchmark for large structured outputs (``_from_text``).
+
+Compares the previous parse-then-reparse-every-element decoder with the
+single-parse + in-place coercion path, with and without ``orjson``.
+
+    python benchmarks/bench_decode.py
+"""
+
+import ast
+import json
+import random
+import time
+
+import funnydspy as fd
+
+
+def legacy_from_text(txt, typ):
+    """The element-wise re-parsing decoder this benchmark replaces."""
+    import typing
+    origin, args = typing.get_origin(typ), typing.get_args(typ)
+    try:
+        if typ is float:
+            return float(txt)
+        if typ is int:
+            return int(txt)
+        if origin is list and args:
+            if txt.strip().startswith("[") and txt.strip().endswith("]"):
+                data = json.loads(txt)
+            else:
+                data = ast.literal_eval(txt)
+            return [legacy_from_text(str(x), args[0]) for x in data]
+        if origin is dict and args:
+            data = json.loads(txt) if txt.lstrip().startswith("{") else ast.literal_eval(txt)
+            k_t, v_t = args
+            return {legacy_from_text(k, k_t): legacy_from_text(v, v_t) for k, v in data.items()}
+    except Exception:
+        pass
+    return txt
+
+
+def bench(label, fn, *args, repeat=3):
+    best = min(_time(fn, *args) for _ in range(repeat))
+    print(f"  {label:<22} {best * 1000:9.1f} ms")
+    return best
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    rng = random.Random(0)
+    cases = {
+        "list[list[float]]": (json.dumps([[rng.random() for _ in range(100)] for _ in range(2000)]),
+                              list[list[float]]),
+        "dict[str, list[int]]": (json.dumps({f"k{i}": [rng.randrange(10**6) for _ in range(200)]
+                                             for i in range(1000)}), dict[str, list[int]]),
+        "python-literal list": (repr([[rng.random() for _ in range(100)] for _ in range(500)]),
+                                list[list[float]]),
+    }
+    fast_loads = fd._json_loads
+    for name, (txt, typ) in cases.items():
+        print(f"{name}  ({len(txt) / 1e6:.1f} MB)")
+        base = bench("legacy", legacy_from_text, txt, typ)
+        fd._json_loads = json.loads
+        bench("single parse (json)", fd._from_text, txt, typ)
+        fd._json_loads = fast_loads
+        new = bench(f"single parse ({fast_loads.__module__})", fd._from_text, txt, typ)
+        print(f"  speed-up vs legacy: {base / new:.1f}x")
+        assert fd._from_text(txt, typ) == legacy_from_text(txt, typ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Build/query benchmark for ``fd.DemoIndex`` (BM25 demo selection).
+
+    python benchmarks/bench_knn_demos.py [pool_size ...]
+"""
+
+import random
+import sys
+import time
+
+import funnydspy as fd
+
+WORDS = [f"w{i}" for i in range(5000)]
+
+
+def make_pool(n, rng):
+    return [{"text": " ".join(rng.choices(WORDS, k=40)), "label": str(i % 7)} for i in range(n)]
+
+
+def main(sizes):
+    rng = random.Random(0)
+    queries = [" ".join(rng.choices(WORDS, k=20)) for _ in range(200)]
+    print(f"{'pool':>8} {'build (s)':>10} {'query (ms)':>11}")
+    for n in sizes:
+        pool = make_pool(n, rng)
+        t0 = time.perf_counter()
+        index = fd.DemoIndex(pool, ["text"])
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for q in queries:
+            index.query(q, k=4)
+        per_query = (time.perf_counter() - t0) / len(queries) * 1000
+        print(f"{n:>8} {build:>10.3f} {per_query:>11.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 50_000])
@@ -26,18 +26,41 @@ __author__ = "FunnyDSPy Contributors"
 __email__ = ""
 __description__ = "Vanilla-Python ergonomics on top of DSPy"
 
-import inspect, ast, textwrap, sys, typing, dataclasses, re, json
+import inspect, ast, textwrap, sys, typing, dataclasses, re, json, copy, importlib, hashlib, time, os, math, heapq, linecache
+import collections, contextlib, difflib, enum, functools, mmap, contextvars, concurrent.futures, itertools, threading, weakref, shelve
 from typing import Any
 import fastcore.docments as fc
+import json_repair
+import pydantic
 import dspy
 from dspy import Signature, InputField, OutputField, Example, Prediction
+from dspy.utils.exceptions import AdapterParseError
+_dspy_settings = importlib.import_module("dspy.dsp.utils.settings")  # the module, not the Settings object
+
+try:  # optional faster JSON backend for large structured outputs
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:  # optional: ndarray outputs and columnar batches
+    import numpy as np
+except ImportError:
+    np = None
 
 # ──────────────────────────────────────────────────────────────────────────────
 # utils: serialise → LM-safe strings
 # -----------------------------------------------------------------------------
 
 def _to_text(v: Any):
-    """Recursively cast numerics/lists to ``str`` so ChatAdapter never crashes."""
+    """Recursively cast numerics/lists to ``str`` so ChatAdapter never crashes.
+
+    File-backed inputs (``FileSlice``, paths, mmaps) are read here, i.e. only
+    when the call is dispatched.
+    """
+    if isinstance(v, Lazy):
+        v = v.result()
+    if isinstance(v, (FileSlice, os.PathLike, mmap.mmap)):
+        return _read_source(v)
     if isinstance(v, list):
         return [_to_text(x) for x in v]
     if isinstance(v, (str, dict)):
@@ -129,8 +152,114 @@ def _extract_dataclass_comments(dataclass_type) -> dict[str, str]:
 # utils: cast LM string → declared Python type
 # -----------------------------------------------------------------------------
 
+def _parse_json(txt: str):
+    """JSON (fast backend when installed), Python-literal fallback for ``['a']`` style."""
+    try:
+        return _json_loads(txt)
+    except ValueError:
+        return ast.literal_eval(txt)
+
+def _each(conv, items):
+    """``[conv(x) …]``, keeping the items ``conv`` cannot convert."""
+    try:
+        return list(map(conv, items))
+    except (TypeError, ValueError):
+        out = []
+        for x in items:
+            try:
+                out.append(conv(x))
+            except (TypeError, ValueError):
+                out.append(x)
+        return out
+
+def _bool(v) -> bool:
+    return v if isinstance(v, bool) else str(v).strip().lower() in ("true", "1", "yes")
+
+def _int(v) -> int:
+    """``int(v)`` that refuses to truncate: ``1.0`` → ``1`` but ``1.5`` raises."""
+    if type(v) is int:
+        return v
+    if isinstance(v, float) and not v.is_integer():
+        raise ValueError(f"{v!r} is not an integer")
+    return int(v)
+
+def _is_model(t) -> bool:
+    """Is *t* a pydantic model class?  (``list[X]`` passes ``isinstance(t, type)`` on 3.10.)"""
+    return typing.get_origin(t) is None and inspect.isclass(t) and issubclass(t, pydantic.BaseModel)
+
+def _has_model(t) -> bool:
+    """Does annotation *t* mention a pydantic model (``Model``, ``list[Model]`` …)?"""
+    return _is_model(t) or any(_has_model(a) for a in typing.get_args(t))
+
+@functools.lru_cache(maxsize=None)
+def _coercer(typ):
+    """Converter ``parsed value -> typ``, built once per annotation.
+
+    Lists are fixed up in place and returned untouched when every element
+    already has the right type (one C-level type scan), so a
+    ``list[list[float]]`` from a single JSON parse is never re-parsed.
+    Unconvertible items are kept as they are (``1.5`` stays ``1.5`` in a
+    ``list[int]``).
+    """
+    origin, args = typing.get_origin(typ), typing.get_args(typ)
+    if _is_ndarray(typ):
+        dtype = _ndarray_spec(typ)[0] or float
+        return lambda v: np.asarray(_parse_json(v) if isinstance(v, str) else v, dtype=dtype)
+    if _has_model(typ):
+        # pydantic-core parses and validates JSON text in one pass
+        adapter = pydantic.TypeAdapter(typ)
+        return lambda v: adapter.validate_json(v) if isinstance(v, str) else adapter.validate_python(v)
+    if typ is bool:
+        return _bool
+    if typ is int:
+        return _int
+    if typ in (str, float):
+        return lambda v: v if type(v) is typ else typ(v)
+    if origin is list and len(args) == 1:
+        (t,) = args
+        item = _coercer(t)
+        exact = {t} if t in (str, int, float, bool) else None
+
+        def conv(v):
+            if isinstance(v, str):
+                return _from_text(v, typ)
+            if not isinstance(v, list) or (exact and set(map(type, v)) <= exact):
+                return v
+            v[:] = _each(item, v)
+            return v
+        return conv
+    if origin is dict and len(args) == 2:
+        key, val = _coercer(args[0]), _coercer(args[1])
+
+        def conv(v):
+            if isinstance(v, str):
+                return _from_text(v, typ)
+            if not isinstance(v, dict):
+                return v
+            return dict(zip(_each(key, v), _each(val, v.values())))
+        return conv
+    return lambda v: v
+
+def _coerce(v, typ):
+    """Cast an already-parsed value to *typ*; on failure *v* comes back as is."""
+    try:
+        conv = _coercer(typ)
+    except TypeError:  # unhashable annotation
+        conv = _coercer.__wrapped__(typ)
+    try:
+        return conv(v)
+    except (TypeError, ValueError, SyntaxError):
+        return v
+
 def _from_text(txt: str, typ):
-    """Best-effort cast of *txt* (string) to *typ*."""
+    """Best-effort cast of *txt* (string) to *typ*.
+
+    Containers are parsed once (see ``_parse_json``) and coerced with
+    ``_coerce``; values the adapter already parsed skip the text step.
+    Pydantic models go straight to their validator.
+    """
+    if not isinstance(txt, str) or _is_ndarray(typ) or _has_model(typ):
+        return _coerce(txt, typ)
     origin = typing.get_origin(typ)
     args   = typing.get_args(typ)
 
@@ -143,19 +272,15 @@ def _from_text(txt: str, typ):
             return txt.strip().lower() in ("true", "1", "yes")
         if origin is list and args:
             # Handle both JSON format and simple comma-separated values
-            if txt.strip().startswith("[") and txt.strip().endswith("]"):
-                data = json.loads(txt)
+            body = txt.strip()
+            if body.startswith("["):
+                data = _parse_json(body)
             else:
-                # Try to parse as comma-separated values
-                try:
-                    data = ast.literal_eval(txt) if txt.strip().startswith("[") else [x.strip() for x in txt.split(",")]
-                except:
-                    data = [x.strip() for x in txt.split(",")]
-            return [_from_text(str(x), args[0]) for x in data]
+                data = [x.strip() for x in txt.split(",")]
+            return _coercer(typ)(data) if isinstance(data, list) else txt
         if origin is dict and args:
-            data = json.loads(txt) if txt.lstrip().startswith("{") else ast.literal_eval(txt)
-            k_t, v_t = args
-            return {_from_text(k, k_t): _from_text(v, v_t) for k, v in data.items()}
+            data = _parse_json(txt.strip())
+            return _coercer(typ)(data) if isinstance(data, dict) else txt
     except Exception:
         pass  # fall through on failure
     return txt  # raw string
@@ -187,6 +312,18 @@ def _output_specs(fn, sig: inspect.Signature):
             f.name                     # raw field name (no prefix)
         ) for f in dataclasses.fields(ret_ann)]
 
+    # pydantic model: descriptions come from ``Field(description=…)`` ---------
+    if _is_model(ret_ann):
+        docmap = _attrs_from_doc(inspect.getdoc(ret_ann) or "")
+        inline_comments = _extract_inline_comments(fn)
+        pref = f"{ret_ann.__name__}_"
+        return [(
+            f"{pref}{name}",
+            f.annotation,
+            f.description or docmap.get(name, "") or inline_comments.get(name, ""),
+            name,
+        ) for name, f in ret_ann.model_fields.items()]
+
     # 2️⃣ external NamedTuple --------------------------------------------------
     if isinstance(ret_ann, type) and issubclass(ret_ann, tuple):
         hints = ret_ann.__annotations__
@@ -335,14 +472,249 @@ def _output_specs(fn, sig: inspect.Signature):
     
     return [("result", ret_ann if ret_ann is not inspect._empty else str, "", "result")]
 
+# -----------------------------------------------------------------------------
+# return reconstruction: Prediction → declared Python type
+# -----------------------------------------------------------------------------
+
+class _ReturnPlan:
+    """Precompiled recipe turning a ``Prediction`` into the declared return value.
+
+    Built once per Signature (at decoration, or when ``funnier`` wraps a bare
+    module) and attached to the module as ``_funky_plan`` so optimised copies
+    keep the original dataclass/NamedTuple return.  ``multi`` picks the
+    container for several unstructured outputs (``Example`` for funky
+    functions, ``dict`` for bare modules).
+    """
+
+    def __init__(self, Sig: type[Signature], ret_ann=inspect.Signature.empty, multi: str = "example",
+                 types: dict[str, Any] | None = None):
+        self.signature = Sig
+        self.ret_ann = ret_ann
+        # Python-side annotations where they differ from what the LM is asked for (ndarray → list)
+        self.outputs = {k: (types or {}).get(k, f.annotation) for k, f in Sig.output_fields.items()}
+        self.inputs = list(Sig.input_fields)
+        self.binder = inspect.Signature(
+            [inspect.Parameter(n, inspect.Parameter.POSITIONAL_OR_KEYWORD) for n in self.inputs])
+        self.cls = None
+        if dataclasses.is_dataclass(ret_ann) or _is_model(ret_ann):
+            pref = f"{ret_ann.__name__}_"
+            self.kind = "dataclass" if dataclasses.is_dataclass(ret_ann) else "model"
+            self.cls = ret_ann
+            self.raw = {k: k[len(pref):] for k in self.outputs if k.startswith(pref)}
+        elif isinstance(ret_ann, type) and issubclass(ret_ann, tuple) and hasattr(ret_ann, "_fields"):
+            self.kind, self.cls = "namedtuple", ret_ann
+        elif typing.get_origin(ret_ann) is tuple:
+            names = list(self.outputs)
+            # internal NamedTuple: the fields carry real names rather than field0, field1 …
+            if len(names) > 1 and all(not n.startswith("field") and n.isidentifier() for n in names):
+                self.kind, self.cls = "namedtuple", collections.namedtuple("Stats", names)
+            else:
+                self.kind = "tuple"
+        else:
+            self.kind = "single" if len(self.outputs) == 1 else multi
+        # near-miss Literal/Enum labels and pydantic outputs need the lenient parser
+        self.lenient = bool(_field_parsers(Sig))
+        self.label_stats = _LabelStats([k for k, f in Sig.output_fields.items() if _is_label_type(f.annotation)])
+
+    def __deepcopy__(self, memo):
+        return self  # optimised copies share the recipe (and its label counters)
+
+    @contextlib.contextmanager
+    def parsing(self, prefix_cache: bool = False, **overrides):
+        """``dspy.context`` for one module call of this Signature.
+
+        Adds the lenient output parser when the outputs need it (and the
+        prefix-cache adapter on request); near-miss counters go to
+        ``label_stats``.  Every call path – funky programs, ``funnier``,
+        ``load`` and streaming – goes through here.
+        """
+        if prefix_cache or self.lenient:
+            adapter = dspy.settings.adapter
+            if prefix_cache:
+                adapter = _adapter_with(_PrefixCacheMixin, adapter)
+                overrides["track_usage"] = True
+            if self.lenient:
+                adapter = _adapter_with(_FieldParseMixin, adapter)
+            overrides["adapter"] = adapter
+        if not overrides:
+            yield
+            return
+        token = _LABEL_STATS.set(self.label_stats)
+        try:
+            with dspy.context(**overrides):
+                yield
+        finally:
+            _LABEL_STATS.reset(token)
+
+    def bind(self, a, k) -> dict[str, Any]:
+        """Map positional/keyword arguments onto input fields (unknown keywords are dropped)."""
+        return self.binder.bind_partial(*a, **{n: v for n, v in k.items()
+                                              if n in self.binder.parameters}).arguments
+
+    def __call__(self, pred: Prediction):
+        out = self.outputs
+        post = {k: _from_text(v, out[k]) for k, v in dict(pred).items() if k in out}
+        if self.kind == "dataclass":
+            return self.cls(**{self.raw[k]: v for k, v in post.items() if k in self.raw})
+        if self.kind == "model":  # strict: a field that did not decode raises ValidationError
+            return self.cls.model_validate({self.raw[k]: v for k, v in post.items() if k in self.raw})
+        if self.kind == "namedtuple":
+            return self.cls(*[post[n] for n in self.cls._fields])
+        if self.kind == "tuple":
+            return tuple(post[n] for n in out if n in post)
+        if len(post) == 1:
+            return next(iter(post.values()))
+        return dict(post) if self.kind == "dict" else Example(**post)
+
 # -----------------------------------------------------------------------------
 # core decorator
 # -----------------------------------------------------------------------------
 
-def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict):
-    if fn is None:
-        return lambda f: funky(f, ModCls=ModCls)
+# registry of every program funky / funnier / load_dir produced ----------------
+
+class _Registry:
+    """Live funky programs (held weakly), for warmup, metrics and serving.
+
+    Iterate it, ``len()`` it, or look programs up by ``name``.
+    """
+
+    def __init__(self):
+        self._items = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add(self, prog):
+        with self._lock:
+            self._items.add(prog)
+        return prog
 
+    def discard(self, prog):
+        with self._lock:
+            self._items.discard(prog)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, prog):
+        return prog in self._items
+
+    def get(self, name: str):
+        """First program called *name* (``None`` if absent)."""
+        return next((p for p in self if getattr(p, "name", None) == name), None)
+
+    def names(self) -> list[str]:
+        return sorted(getattr(p, "name", "?") for p in self)
+
+registry = _Registry()
+
+# compiled programs are memoised so ``@fd.Predict def f(...)`` inside a loop or a
+# recursive call costs a dict lookup instead of source parsing + module build.
+_FUNKY_CACHE: collections.OrderedDict = collections.OrderedDict()
+_FUNKY_CACHE_SIZE = 512
+_FUNKY_LOCK = threading.Lock()
+
+class _LRU(collections.OrderedDict):
+    """``dict`` holding at most *maxsize* entries; the least recently used go first.
+
+    Not thread-safe on its own: callers guard it with their lock.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+def _freeze(v):
+    """Hashable stand-in for *v* (lists → tuples …); ``TypeError`` if impossible."""
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(x) for x in v)
+    if isinstance(v, (set, frozenset)):
+        return frozenset(_freeze(x) for x in v)
+    if isinstance(v, dict):
+        return tuple((k, _freeze(x)) for k, x in v.items())
+    hash(v)
+    return v
+
+def _funky_key(fn, ModCls, opts: dict):
+    """Everything the compiled program depends on, or ``None`` if unhashable.
+
+    Identical code + resolved annotations ⇒ identical Signature.  String
+    (postponed) annotations may refer to closure variables such as
+    ``Literal[*headers]``, so closure contents join the key in that case.
+    Comments (docments, inline notes) are not part of the code object, so
+    the function's source lines join the key too (a plain ``linecache``
+    slice, cheap enough for every re-decoration).
+    """
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        return None
+    ann = getattr(fn, "__annotations__", {})
+    last = max((line for *_, line in code.co_lines() if line), default=code.co_firstlineno)
+    source = "".join(linecache.getlines(code.co_filename)[code.co_firstlineno - 1:last]) or None
+    try:
+        cells = ()
+        if any(isinstance(a, str) for a in ann.values()):
+            cells = _freeze([c.cell_contents for c in fn.__closure__ or ()])
+        return (code, ModCls, id(fn.__globals__), fn.__doc__, source, _freeze(ann), cells, _freeze(opts))
+    except (TypeError, ValueError):  # unhashable annotation / empty cell
+        return None
+
+def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict, prefix_cache: bool = False,
+          hedge: "Hedge | bool" = False, module_opts: dict[str, Any] | None = None):
+    """Turn *fn* into a DSPy-backed program (see module docstring).
+
+    Options
+    -------
+    prefix_cache:
+        Lay prompts out for provider-side prompt caching (static
+        instructions/demos first, byte-identical across calls), add
+        cache-control hints where the LM supports them and count cache hits
+        (``prog.prompt_cache_stats()``).
+    hedge:
+        ``True`` or an ``fd.Hedge`` policy: duplicate calls that outlive the
+        observed latency percentile (``prog.hedge.stats()``).  Per call,
+        ``_hedge=policy`` or ``_hedge=False`` overrides it.
+    module_opts:
+        Extra keyword arguments for ``ModCls(signature, ...)``, e.g. the
+        ``tools``/``max_iters`` of ``dspy.ReAct`` (plain functions are
+        turned into tools, see :func:`tool`).
+    """
+    opts = {k: v for k, v in dict(prefix_cache=prefix_cache, hedge=hedge, module_opts=module_opts).items() if v}
+    if fn is None:
+        return lambda f: funky(f, ModCls=ModCls, **opts)
+
+    key = _funky_key(fn, ModCls, opts)
+    if key is not None:
+        with _FUNKY_LOCK:
+            prog = _FUNKY_CACHE.get(key)
+            if prog is not None:
+                _FUNKY_CACHE.move_to_end(key)
+                return prog
+    prog = _compile(fn, ModCls, **opts)
+    if key is not None:
+        with _FUNKY_LOCK:
+            prog = _FUNKY_CACHE.setdefault(key, prog)  # first builder wins a race
+            _FUNKY_CACHE.move_to_end(key)
+            while len(_FUNKY_CACHE) > _FUNKY_CACHE_SIZE:
+                _FUNKY_CACHE.popitem(last=False)
+    return prog
+
+def _compile(fn, ModCls: type[dspy.Module], prefix_cache: bool = False, hedge: "Hedge | bool" = False,
+             module_opts: dict[str, Any] | None = None):
+    """Build the Signature, the DSPy module and the ``_Prog`` wrapper for *fn*."""
     sig_py   = inspect.signature(fn)
     in_desc  = _input_descs(fn)
     out_spec = _output_specs(fn, sig_py)
@@ -356,9 +728,12 @@ def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict):
         fields[p] = InputField(desc=in_desc.get(p, ""))
         annotations[p] = param.annotation if param.annotation != inspect.Parameter.empty else str
         
+    py_types: dict[str, Any] = {}
     for n, typ, desc, _ in out_spec:  # outputs
         fields[n] = OutputField(desc=desc)
         annotations[n] = typ
+        if _is_ndarray(typ):  # the LM answers with (nested) lists
+            annotations[n], py_types[n] = _ndarray_lm_type(typ), typ
 
     # Create signature class with proper annotations
     class_dict = fields.copy()
@@ -367,7 +742,15 @@ def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict):
         class_dict['__doc__'] = fn.__doc__
     
     Sig = type(f"{fn.__name__.title()}Sig", (Signature,), class_dict)
-    default_mod = ModCls(Sig)
+    plan = _ReturnPlan(Sig, sig_py.return_annotation, types=py_types)
+    mod_args = dict(module_opts or {})
+    if "tools" in mod_args:  # ReAct-style modules: plain functions → dspy.Tool
+        mod_args["tools"] = _as_tools(mod_args["tools"], mod_args.pop("parallel_tools", False))
+    default_mod = ModCls(Sig, **mod_args)
+    default_mod._funky_plan = plan  # survives optimiser deepcopies → ``funnier``
+    local = threading.local()
+    cache_stats = _PromptCacheStats()
+    hedge_policy = Hedge() if hedge is True else (hedge or None)
 
     # module wrapper ----------------------------------------------------------
     class _Prog:
@@ -380,76 +763,130 @@ def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict):
         """
         signature = Sig
 
-        def __call__(self, *a, _prediction: bool = False, **k):
+        def __call__(self, *a, _prediction: bool = False, _hedge: "Hedge | bool | None" = None,
+                     _timeout: float | None = None, **k):
             if "_prediction" in k:
                 raise TypeError("pass _prediction without the preceding * in positional/keyword mix")
-            ex = Example(**sig_py.bind_partial(*a, **k).arguments)
-            kwargs = {kk: _to_text(vv) for kk, vv in dict(ex).items()}
-            res: Prediction = default_mod(**kwargs)
+            scope = _LAZY.get()
+            if scope is not None:
+                return scope.submit(self, a, {**k, "_prediction": _prediction, "_hedge": _hedge,
+                                              "_timeout": _timeout})
+            run = _INCREMENTAL.get() if not _tracing() else None
+            with deadline(_timeout) if _timeout is not None else contextlib.nullcontext():
+                if run is None:
+                    res: Prediction = self._run(self._inputs(a, k), _hedge)
+                else:
+                    res = run.call(self, a, k, lambda inputs: self._run(inputs, _hedge))
             if _prediction:
                 return res
-
-            # cast outputs → Python types -----------------------------------
-            post: dict[str, Any] = {}
-            ret_ann = sig_py.return_annotation
-
-            if dataclasses.is_dataclass(ret_ann):
-                pref = f"{ret_ann.__name__}_"
-                for kk, vv in dict(res).items():
-                    if kk.startswith(pref):
-                        raw = kk[len(pref):]  # strip dataclass prefix
-                        ann = Sig.output_fields[kk].annotation
-                        post[raw] = _from_text(vv, ann)
-                return ret_ann(**post)  # Stats(**...)
-
-            # other structured returns -------------------------------------
-            for kk, vv in dict(res).items():
-                if kk in Sig.output_fields:  # Only process fields we defined
-                    ann = Sig.output_fields[kk].annotation
-                    post[kk] = _from_text(vv, ann)
-
-            if isinstance(ret_ann, type) and issubclass(ret_ann, tuple) and hasattr(ret_ann, "_fields"):
-                return ret_ann(*[post[n] for n in ret_ann._fields])
-            
-            # Check if this is an internal NamedTuple case
-            # This happens when the function defines a NamedTuple inside and returns it
-            if typing.get_origin(ret_ann) is tuple and len(post) > 1:
-                # Try to detect if we have NamedTuple field names
-                field_names = list(post.keys())
-                # Check if field names look like NamedTuple fields (not generic field0, field1)
-                if (len(field_names) > 1 and 
-                    all(not name.startswith('field') for name in field_names) and
-                    all(name.isidentifier() for name in field_names)):
-                    # This looks like a NamedTuple - create a dynamic NamedTuple class
-                    from typing import NamedTuple
-                    from collections import namedtuple
-                    
-                    # Create a NamedTuple class dynamically
-                    field_types = []
-                    for name in field_names:
-                        if name in Sig.output_fields:
-                            field_types.append((name, Sig.output_fields[name].annotation))
-                        else:
-                            field_types.append((name, type(post[name])))
-                    
-                    # Create the NamedTuple class
-                    DynamicStats = namedtuple('Stats', field_names)
-                    
-                    # Return the NamedTuple instance
-                    return DynamicStats(*[post[name] for name in field_names])
-            
-            if typing.get_origin(ret_ann) is tuple:
-                return tuple(post[n] for n in Sig.output_fields if n in post)
-            if len(post) == 1:
-                return next(iter(post.values()))
-            return Example(**post)
+            out = self._decode(res)
+            if run is not None:
+                run.produced(res, out)
+            return out
+
+        def _run(self, inputs: dict[str, Any], hedge: "Hedge | bool | None" = None) -> Prediction:
+            """One module call with the per-program call options applied."""
+            extra = {}
+            if self.demo_index is not None and not _tracing():
+                extra["demos"] = self.demo_index.query(inputs, self.demo_k)
+            hedge = self.hedge if hedge is None else hedge
+            if _tracing():  # optimiser traces stay on the calling thread
+                return self._attempt(inputs, extra)
+            when = _DEADLINE.get()
+            if when is not None and _remaining(when) <= 0:
+                raise DeadlineExceeded("deadline passed before the call was sent")
+            if hedge:
+                return hedge.run(lambda lm: self._attempt(inputs, extra, lm), when)
+            if when is None:
+                return self._attempt(inputs, extra)
+            return _await(_spawn(self._attempt, inputs, extra), when)
+
+        def _attempt(self, inputs: dict[str, Any], extra: dict[str, Any], lm=None) -> Prediction:
+            """A single request to the LM (``lm`` overrides the configured one)."""
+            mod = self._module()
+            when = _DEADLINE.get()
+            if when is not None:  # the HTTP request itself gives up at the deadline
+                lm = _with_timeout(lm or dspy.settings.lm, _remaining(when))
+            overrides: dict[str, Any] = {} if lm is None else {"lm": lm}
+            with plan.parsing(prefix_cache, **overrides):
+                res = mod(**inputs, **extra)
+            if prefix_cache:
+                cache_stats.record(res)
+            return res
+
+        demo_index = None
+        demo_k = 0
+        hedge: "Hedge | None" = hedge_policy
+
+        def use_demo_pool(self, pool, k: int = 4, fields: list[str] | None = None):
+            """Select the *k* most similar demos from *pool* for every call.
+
+            *pool* is a ``DemoIndex`` or a list of ``dspy.Example``/dicts (indexed
+            with BM25 on the input fields).  Replaces the fixed demos the module
+            would otherwise attach; ``use_demo_pool(None)`` switches it off.
+            Works for modules that forward ``demos=`` to their predictor
+            (``Predict``, ``ChainOfThought``).
+            """
+            if pool is not None and not isinstance(pool, DemoIndex):
+                pool = DemoIndex(pool, fields or list(Sig.input_fields))
+            self.demo_index, self.demo_k = pool, k
+            return self
+
+        def label_stats(self) -> dict[str, dict[str, int]]:
+            """Match-quality counters of each ``Literal``/``Enum`` output field."""
+            return plan.label_stats.snapshot()
+
+        def prompt_cache_stats(self) -> dict[str, Any]:
+            """Prompt/cached token totals and hit ratio (``prefix_cache=True`` programs)."""
+            return cache_stats.snapshot()
+
+        def _module(self) -> dspy.Module:
+            """This thread's view of ``default_mod`` (see ``_thread_clone``)."""
+            if _tracing():
+                return default_mod  # optimisers match traces to the real predictors
+            fp = _fingerprint(default_mod)
+            if getattr(local, "fp", None) != fp:
+                local.mod, local.fp = _thread_clone(default_mod), fp
+            return local.mod
+
+        def _inputs(self, a, k) -> dict[str, Any]:
+            """Bind call arguments and make them LM-safe."""
+            ex = Example(**sig_py.bind_partial(*a, **k).arguments)
+            return {kk: _to_text(vv) for kk, vv in dict(ex).items()}
+
+        def _decode(self, res: Prediction):
+            """Cast a ``Prediction`` back into the declared Python return type."""
+            return plan(res)
+
+        # streaming ---------------------------------------------------------
+        def stream(self, *a, **k):
+            """Yield ``dspy.streaming.StreamResponse`` chunks as each output field
+            (``reasoning`` included for ``ChainOfThought``) fills in, then the
+            typed return value as the last item."""
+            mod = self._module()
+            prog = dspy.streamify(mod, stream_listeners=_stream_listeners(mod), async_streaming=False)
+            with plan.parsing():
+                for ev in prog(**self._inputs(a, k)):
+                    yield self._decode(ev) if isinstance(ev, Prediction) else ev
+
+        async def astream(self, *a, **k):
+            """Async variant of :meth:`stream`."""
+            mod = self._module()
+            prog = dspy.streamify(mod, stream_listeners=_stream_listeners(mod))
+            with plan.parsing():
+                async for ev in prog(**self._inputs(a, k)):
+                    yield self._decode(ev) if isinstance(ev, Prediction) else ev
 
         # pipe version keeps an Example so DSPy chains stay intact -----------
         def __ror__(self, lhs):
             if isinstance(lhs, tuple):
                 lhs = dict(zip(sig_py.parameters, lhs))
+            elif isinstance(lhs, Example):
+                lhs = dict(lhs)
+            elif _is_collection(lhs):
+                return (self.__ror__(r) for r in lhs)  # lazy: streams into the next stage
             if not isinstance(lhs, dict):
-                raise TypeError("lhs must be tuple or dict")
+                raise TypeError("lhs must be tuple, dict, Example or an iterable of those")
             ex = Example(**lhs); ex._signature = Sig
             return ex
 
@@ -458,31 +895,296 @@ def funky(fn=None, *, ModCls: type[dspy.Module] = dspy.Predict):
 
     _Prog.module = default_mod  # expose raw DSPy module for optimizers
     _Prog._dspy  = default_mod  # synonym (shorter)
-    return _Prog()
+    _Prog.name   = fn.__name__
+    return registry.add(_Prog())
+
+# prompt-prefix-stable layout for provider prompt caching ---------------------
+
+# Providers that only cache when the prompt carries explicit cache-control
+# breakpoints (OpenAI-style APIs cache stable prefixes automatically).
+_CACHE_CONTROL_MODELS = re.compile(r"anthropic|claude", re.I)
+
+class _PrefixCacheMixin:
+    """Adapter mixin: static prefix (system + demos) first, then a breakpoint.
+
+    The chat adapters already emit instructions, field descriptions and demos
+    before the variable inputs; this mixin pins that contract (the inputs are
+    always the *last* message, nothing varying precedes them) and marks the
+    last static message with ``cache_control`` for providers that need it.
+    """
+
+    def __call__(self, lm, lm_kwargs, signature, demos, inputs):
+        self._lm = lm
+        return super().__call__(lm, lm_kwargs, signature, demos, inputs)
+
+    async def acall(self, lm, lm_kwargs, signature, demos, inputs):
+        self._lm = lm
+        return await super().acall(lm, lm_kwargs, signature, demos, inputs)
+
+    def format(self, signature, demos, inputs):
+        messages = super().format(signature, demos, inputs)
+        model = getattr(getattr(self, "_lm", None), "model", "") or ""
+        if len(messages) > 1 and _CACHE_CONTROL_MODELS.search(model):
+            last_static = dict(messages[-2])
+            content = last_static["content"]
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            last_static["content"] = [*content[:-1], {**content[-1], "cache_control": {"type": "ephemeral"}}]
+            messages = [*messages[:-2], last_static, messages[-1]]
+        return messages
+
+_MIXIN_ADAPTERS: dict[tuple[type, type], type] = {}
+
+def _adapter_with(mixin: type, base=None):
+    """A per-call copy of *base* (default ``ChatAdapter``) with *mixin* on top."""
+    base = base or dspy.ChatAdapter()
+    key = (mixin, type(base))
+    cls = _MIXIN_ADAPTERS.get(key)
+    if cls is None:
+        name = mixin.__name__.strip("_").replace("Mixin", "") + type(base).__name__
+        cls = _MIXIN_ADAPTERS.setdefault(key, type(name, (mixin, type(base)), {}))
+    adapter = copy.copy(base)
+    adapter.__class__ = cls
+    return adapter
+
+class _PromptCacheStats:
+    """Thread-safe totals of prompt vs. provider-cached input tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = self.prompt_tokens = self.cached_tokens = 0
+
+    def record(self, pred: Prediction):
+        usage = (pred.get_lm_usage() if hasattr(pred, "get_lm_usage") else None) or {}
+        prompt = cached = 0
+        for u in usage.values():
+            prompt += u.get("prompt_tokens") or 0
+            cached += ((u.get("prompt_tokens_details") or {}).get("cached_tokens")
+                       or u.get("cache_read_input_tokens") or 0)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt
+            self.cached_tokens += cached
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            ratio = self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+            return {"calls": self.calls, "prompt_tokens": self.prompt_tokens,
+                    "cached_tokens": self.cached_tokens, "hit_ratio": ratio}
+
+# thread-safe calls on a shared module ----------------------------------------
+
+# Attributes DSPy appends to while a module runs; everything else (signature,
+# demos, config, lm …) is read-only during a call and can be shared.
+_CALL_STATE = ("history", "traces", "train")
+
+def _tracing() -> bool:
+    """True inside an optimiser's ``dspy.context(trace=[])`` block."""
+    trace = dspy.settings.trace
+    return trace is not None and trace is not _dspy_settings.main_thread_config.get("trace")
+
+def _submodules(mod):
+    yield mod
+    for v in vars(mod).values():
+        if isinstance(v, dspy.BaseModule):
+            yield from _submodules(v)
+
+def _fingerprint(mod) -> tuple:
+    """Identity of the shared state: changes when demos, signature, lm … are reassigned."""
+    return tuple(id(v) for m in _submodules(mod)
+                 for k, v in vars(m).items() if k not in _CALL_STATE)
+
+_HISTORY_LOCK = threading.Lock()
+
+class _ForwardedHistory(list):
+    """A clone's own ``history`` that also records every entry on *origin*.
+
+    Keeps ``prog.module.history`` / ``inspect_history()`` working although
+    calls run on per-thread clones; the shared list is appended to under a
+    lock and trimmed to ``dspy.settings.max_history_size``.
+    """
+
+    def __init__(self, origin):
+        super().__init__()
+        self.origin = origin
+
+    def append(self, entry):
+        super().append(entry)
+        limit = dspy.settings.max_history_size
+        with _HISTORY_LOCK:
+            shared = self.origin.history
+            shared.append(entry)
+            if limit is not None and len(shared) > limit:
+                del shared[:len(shared) - limit]
+
+def _thread_clone(mod):
+    """Shallow copy of *mod* (and its sub-modules) with private call state.
+
+    Demos, signatures and config are shared by reference, so a clone costs a
+    few dict copies instead of a ``deepcopy``; traces no longer interleave
+    between threads, and history entries are forwarded to *mod* in order of
+    completion (see ``_ForwardedHistory``).
+    """
+    clone = copy.copy(mod)
+    for k, v in vars(mod).items():
+        if k == "history":
+            setattr(clone, k, _ForwardedHistory(mod))
+        elif k in _CALL_STATE:
+            setattr(clone, k, [])
+        elif isinstance(v, dspy.BaseModule):
+            setattr(clone, k, _thread_clone(v))
+    return clone
+
+def _stream_listeners(mod: dspy.Module) -> list:
+    """Fresh listeners (they are stateful) for every output field of every predictor."""
+    from dspy.streaming import StreamListener
+    return [
+        StreamListener(signature_field_name=name, predict=pred, predict_name=pname)
+        for pname, pred in mod.named_predictors()
+        for name in pred.signature.output_fields
+    ]
+
+# parallel engine shared by collection pipes ----------------------------------
+
+def _is_collection(x) -> bool:
+    """Iterables of records (list, generator …) but not a single record/string."""
+    return not isinstance(x, (str, bytes, dict, tuple, Example)) and hasattr(x, "__iter__")
+
+def _imap(fn, items, num_threads: int | None = None):
+    """Ordered, streaming ``map`` over a thread pool.
+
+    Items are pulled from *items* only as slots free up (at most
+    ``2 * num_threads`` in flight), and each result is yielded as soon as it
+    and everything before it are done, so a downstream stage can start on
+    record 0 while record 10 is still running.  DSPy settings (``dspy.context``)
+    are propagated to the workers.
+    """
+    num_threads = num_threads or dspy.settings.num_threads or 8
+    it = iter(items)
+    window: collections.deque = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(num_threads, thread_name_prefix="funnydspy") as pool:
+        def fill():
+            while len(window) < 2 * num_threads:
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                window.append(pool.submit(contextvars.copy_context().run, fn, item))
+        fill()
+        while window:
+            yield window.popleft().result()
+            fill()
 
 # pipeable wrappers around every DSPy module ----------------------------------
 
-def _pipe_mod(ModCls: type[dspy.Module]):
+class _PipeEntry(typing.NamedTuple):
+    """A cached pipe module plus the decoding metadata derived from its Signature."""
+    mod: dspy.Module
+    inputs: frozenset
+    decoders: dict  # output field → annotation for ``_from_text``
+
+class _ModuleCache:
+    """Bounded, thread-safe LRU of ``ModCls(sig)`` keyed by Signature class.
+
+    LRU order is kept with *weak* references.  The entry itself is stored on
+    the Signature class, so the ``sig → module → sig`` cycle is collectable
+    once user code drops a dynamically created Signature; eviction just
+    deletes that slot.  Each Signature's module is built at most once even
+    when many threads pipe through it concurrently.
+    """
+    _ids = itertools.count()
+
+    def __init__(self, factory, maxsize: int = 256):
+        self._factory = factory
+        self.maxsize = maxsize
+        self._slot = f"_funnydspy_pipe_{next(self._ids)}"
+        self._order: collections.OrderedDict = collections.OrderedDict()  # weakref → None
+        self._pending: dict = {}  # weakref → Future, while a builder is running
+        self._dead: list = []     # filled by weakref callbacks, purged under the lock
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, sig) -> _PipeEntry:
+        ref = weakref.ref(sig, self._dead.append)
+        with self._lock:
+            self._purge()
+            entry = sig.__dict__.get(self._slot)
+            if entry is not None:
+                self.hits += 1
+                self._order.move_to_end(ref)
+                return entry
+            fut = self._pending.get(ref)
+            builder = fut is None
+            if builder:
+                self.misses += 1
+                fut = self._pending[ref] = concurrent.futures.Future()
+            else:
+                self.hits += 1
+        if not builder:
+            return fut.result()
+        try:
+            entry = _PipeEntry(self._factory(sig), frozenset(sig.input_fields),
+                               {k: f.annotation for k, f in sig.output_fields.items()})
+        except BaseException as e:
+            with self._lock:
+                del self._pending[ref]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[ref]
+            setattr(sig, self._slot, entry)
+            self._order[ref] = None
+            while len(self._order) > self.maxsize:
+                old, _ = self._order.popitem(last=False)
+                victim = old()
+                if victim is not None:
+                    delattr(victim, self._slot)
+                self.evictions += 1
+        fut.set_result(entry)
+        return entry
+
+    def _purge(self):
+        while self._dead:
+            self._order.pop(self._dead.pop(), None)
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            self._purge()
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._order), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            for ref in self._order:
+                sig = ref()
+                if sig is not None:
+                    delattr(sig, self._slot)
+            self._order.clear()
+
+def _pipe_mod(ModCls: type[dspy.Module], maxsize: int = 256):
     class W:
         def __init__(self):
-            self._mods: dict[type[Signature], dspy.Module] = {}
+            self._mods = _ModuleCache(ModCls, maxsize)
 
         def __call__(self, *a, **k):
             return ModCls(*a, **k)
 
         def __ror__(self, ex: Example):
+            if _is_collection(ex):
+                return _imap(self.__ror__, ex)
             sig = getattr(ex, "_signature", None)
             if sig is None:
                 raise ValueError("missing _signature on lhs")
-            mod = self._mods.get(sig) or ModCls(sig)
-            self._mods[sig] = mod
+            entry = self._mods.get(sig)
             kw = {k: _to_text(v) for k, v in dict(ex).items()}
-            res = mod(**kw)
-            inputs = set(sig.input_fields)
-            keep = {k: v for k, v in dict(res).items() if k not in inputs}
-            typed = {k: _from_text(v, sig.output_fields[k].annotation) if k in sig.output_fields else v
-                     for k, v in keep.items()}
-            return Example(**typed)
+            res = entry.mod(**kw)
+            dec = entry.decoders
+            return Example(**{k: _from_text(v, dec[k]) if k in dec else v
+                              for k, v in dict(res).items() if k not in entry.inputs})
+
+        def cache_info(self) -> dict[str, int]:
+            """Hit/miss/eviction counters of the per-Signature module cache."""
+            return self._mods.info()
 
         def __repr__(self):
             return f"<pipeable {ModCls.__name__}>"
@@ -499,14 +1201,28 @@ if hasattr(_mod, "chainofthought"):
 # decorator aliases mirroring real DSPy modules
 # -----------------------------------------------------------------------------
 
-def Predict(fn=None):
-    return funky(fn, ModCls=dspy.Predict) if fn else lambda f: funky(f, ModCls=dspy.Predict)
+def Predict(fn=None, **opts):
+    return funky(fn, ModCls=dspy.Predict, **opts) if fn else lambda f: funky(f, ModCls=dspy.Predict, **opts)
 
-def ChainOfThought(fn=None):
-    return funky(fn, ModCls=dspy.ChainOfThought) if fn else lambda f: funky(f, ModCls=dspy.ChainOfThought)
+def ChainOfThought(fn=None, **opts):
+    return funky(fn, ModCls=dspy.ChainOfThought, **opts) if fn else lambda f: funky(f, ModCls=dspy.ChainOfThought, **opts)
 
-def ReAct(fn=None):
-    return funky(fn, ModCls=dspy.ReAct) if fn else lambda f: funky(f, ModCls=dspy.ReAct)
+def ReAct(fn=None, *, tools=(), max_iters: int = 20, parallel_tools: bool = True, **opts):
+    """``dspy.ReAct`` agent over *tools* (plain functions, :func:`tool` wrappers or ``dspy.Tool``).
+
+    With several tools, ``parallel_tools`` adds a ``run_parallel`` tool so
+    the agent can issue independent calls of one step concurrently.
+
+    Example
+    -------
+    ```python
+    @fd.ReAct(tools=[search, fd.tool(convert, cache=True)], max_iters=6)
+    def research(question: str) -> str:
+        return answer
+    ```
+    """
+    opts["module_opts"] = {"tools": tuple(tools), "max_iters": max_iters, "parallel_tools": parallel_tools}
+    return funky(fn, ModCls=dspy.ReAct, **opts) if fn else lambda f: funky(f, ModCls=dspy.ReAct, **opts)
 
 for _name in ("Predict", "ChainOfThought", "ReAct"):
     setattr(_mod, _name, globals()[_name])
@@ -523,6 +1239,10 @@ def register(cls, alias: str | None = None):
 def funnier(mod, *, alias: str | None = None):
     """Return a *pythonic* wrapper around a **DSPy *instance***.
 
+    Argument binding and output decoding are compiled once here.  Modules
+    that came from a funky function (including optimised copies) keep its
+    return reconstruction, so ``Stats`` stays a ``Stats``.
+
     Example
     -------
     ```python
@@ -530,43 +1250,24 @@ def funnier(mod, *, alias: str | None = None):
     analyse_opt = fd.funnier(optim)       # normal call → Stats
     ```
     """
-    Sig = mod.signature
+    plan = getattr(mod, "_funky_plan", None) or _ReturnPlan(mod.signature, multi="dict")
+    Sig = plan.signature
 
     def _call(*a, _prediction: bool = False, **k):
-        # Remove _prediction from kwargs if it exists (it's not part of the DSPy signature)
         if "_prediction" in k:
             raise TypeError("pass _prediction without the preceding * in positional/keyword mix")
-        
-        # Get the input field names in order
-        input_fields = list(Sig.input_fields.keys())
-        
-        # Convert positional arguments to keyword arguments
-        # Map positional args to input field names
-        for i, arg in enumerate(a):
-            if i < len(input_fields):
-                field_name = input_fields[i]
-                if field_name in k:
-                    raise TypeError(f"got multiple values for argument '{field_name}'")
-                k[field_name] = arg
-            else:
-                raise TypeError(f"too many positional arguments")
-        
-        # Create Example with only the input fields
-        input_kwargs = {name: k[name] for name in input_fields if name in k}
-        ex = Example(**input_kwargs)
-        
-        kwargs = {kk: _to_text(vv) for kk, vv in dict(ex).items()}
-        pred: dspy.Prediction = mod(**kwargs)
+        with plan.parsing():
+            pred: dspy.Prediction = mod(**{kk: _to_text(vv) for kk, vv in plan.bind(a, k).items()})
         if _prediction:
             return pred
-        post = {kk: _from_text(vv, Sig.output_fields[kk].annotation) for kk, vv in dict(pred).items()}
-        if len(post) == 1:
-            return next(iter(post.values()))
-        return post
+        return plan(pred)
 
     _call.module = mod
     _call._dspy  = mod
-    return _call
+    _call._decode = plan
+    _call.signature = Sig
+    _call.name = alias or Sig.__name__
+    return registry.add(_call)
 
 # expose helper in module namespace
 setattr(_mod, "funnier", funnier)
@@ -715,6 +1416,20 @@ __all__ = [
     "funnier",
     "parallel",
     "parallelize",
+    "lazy",
+    "gather",
+    "Lazy",
+    "evaluate",
+    "EvalResult",
+    "EvalRow",
+    "save",
+    "load",
+    "load_dir",
+    "LazyProgram",
+    "registry",
+    "warmup",
+    "DemoIndex", "tree_reduce", "FileSlice", "cascade", "Hedge", "deadline", "DeadlineExceeded", "TimedOut", "AIMD", "LMPool", "Columns",
+    "incremental", "IncrementalRun", "Step", "tool",
     "__version__",
 ]
 
@@ -722,12 +1437,23 @@ __all__ = [
 # Simple parallel execution utility
 # -----------------------------------------------------------------------------
 
-def parallel(func, inputs_list):
+def parallel(func, inputs_list, *, timeout: float | None = None, concurrency: "int | AIMD | None" = None,
+             lms: "LMPool | None" = None, as_columns: bool = False):
     """Execute func in parallel for each input set in inputs_list.
     
     Args:
         func: A FunnyDSPy function (decorated with @fd.Predict, @fd.ChainOfThought, etc.)
         inputs_list: List of input dictionaries
+        timeout: Deadline for the whole batch in seconds.  Nested funky calls
+            inherit it; items that miss it come back as ``fd.TimedOut(inputs)``.
+        concurrency: Fixed number of threads, or an ``fd.AIMD`` controller
+            that adapts the in-flight limit to observed errors and latency.
+        lms: An ``fd.LMPool`` to spread the items over (least outstanding
+            requests, per-endpoint limits, unhealthy endpoints ejected).
+            Threads default to the pool's total capacity.
+        as_columns: Return an ``fd.Columns`` dict with one column per output
+            field (NumPy arrays for numeric fields) instead of one object
+            per item.  Needs numpy.
         
     Returns:
         List of results from parallel execution
@@ -760,10 +1486,41 @@ def parallel(func, inputs_list):
         else:
             raise TypeError(f"Expected a FunnyDSPy function, got {type(func)}")
     
+    if as_columns and np is None:
+        raise ImportError("as_columns=True needs numpy")
+
+    if timeout is not None or _DEADLINE.get() is not None or isinstance(concurrency, AIMD) or lms is not None:
+        # an enclosing fd.deadline bounds the batch too; with as_columns rows stay Predictions and go straight into the columns
+        one = functools.partial(func, _prediction=True) if as_columns else func
+        call = (lambda inp: one(**inp)) if lms is None else (lambda inp: lms.call(lambda: one(**inp)))
+        if isinstance(concurrency, AIMD):
+            results = _run_batch(call, inputs_list, timeout, limiter=concurrency)
+        else:
+            threads = concurrency or (lms and (lms.capacity or len(lms) * (dspy.settings.num_threads or 8)))
+            results = _run_batch(call, inputs_list, timeout, threads)
+        return _columns(_plan_of(func), results) if as_columns else results
+
     # Build pairs for dspy.Parallel
-    pairs = [(func.module, inp) for inp in inputs_list]
-    predictions = dspy.Parallel().forward(pairs)
+    # inputs stay as given (file handles included) until a worker dispatches them;
+    # funky programs run their full call path (demos, adapters, hedging …)
+    if hasattr(func, "_attempt"):
+        call = lambda **inp: func(_prediction=True, **inp)
+    else:
+        call = _dispatch(func.module)
+    # dspy.Parallel copies DSPy settings only: run each item in a copy of the
+    # caller's context so fd.incremental / fd.lazy scopes reach the workers
+    ctx = contextvars.copy_context()
+    in_context = lambda **inp: ctx.copy().run(call, **inp)
+    pairs = [(in_context, inp) for inp in inputs_list]
+    predictions = dspy.Parallel(num_threads=concurrency).forward(pairs)
+    if as_columns:
+        return _columns(_plan_of(func), predictions)
     
+    # funky / funnier programs carry their compiled return reconstruction
+    decode = getattr(func, "_decode", None)
+    if decode is not None:
+        return [decode(pred) for pred in predictions]
+
     # Extract the actual return values from predictions
     results = []
     for pred in predictions:
@@ -827,7 +1584,8 @@ def parallel(func, inputs_list):
                 
     return results
 
-def parallelize(func):
+def parallelize(func, *, timeout: float | None = None, concurrency: "int | AIMD | None" = None,
+                lms: "LMPool | None" = None):
     """Create a parallelizable version of any function (DSPy-style).
     
     This returns a function that can be called with a list of input dictionaries
@@ -835,6 +1593,10 @@ def parallelize(func):
     
     Args:
         func: Any function (FunnyDSPy decorated or regular Python function)
+        timeout: Default batch deadline in seconds (see ``parallel``); the
+            returned function also accepts ``timeout=`` per batch.
+        concurrency: Thread count or ``fd.AIMD`` controller (see ``parallel``).
+        lms: ``fd.LMPool`` to spread the calls over (see ``parallel``).
         
     Returns:
         A function that takes a list of input dictionaries and returns parallel results
@@ -855,14 +1617,24 @@ def parallelize(func):
         results = parallel_process([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}])
     """
     
-    def parallel_executor(inputs_list):
+    def parallel_executor(inputs_list, timeout: float | None = timeout):
         if not inputs_list:
             return []
             
         # Check if this is a FunnyDSPy decorated function
         if hasattr(func, 'module'):
             # Use the optimized DSPy parallel execution
-            return parallel(func, inputs_list)
+            return parallel(func, inputs_list, timeout=timeout, concurrency=concurrency, lms=lms)
+        elif (timeout is not None or _DEADLINE.get() is not None or isinstance(concurrency, AIMD)
+              or lms is not None):
+            # Deadlines, AIMD and LM pools need our own abandonable workers
+            call = lambda inp: func(**inp) if isinstance(inp, dict) else func(inp)
+            if lms is not None:
+                call = lambda inp, _call=call: lms.call(lambda: _call(inp))
+            if isinstance(concurrency, AIMD):
+                return _run_batch(call, inputs_list, timeout, limiter=concurrency)
+            threads = concurrency or (lms and (lms.capacity or len(lms) * (dspy.settings.num_threads or 8)))
+            return _run_batch(call, inputs_list, timeout, threads)
         else:
             # For regular Python functions, use sequential execution
             # (Could be extended to use multiprocessing if needed)
@@ -878,6 +1650,1844 @@ def parallelize(func):
     
     return parallel_executor
 
+# -----------------------------------------------------------------------------
+# Lazy dataflow: funky calls return futures inside ``with fd.lazy():``
+# -----------------------------------------------------------------------------
+
+_LAZY: contextvars.ContextVar = contextvars.ContextVar("funnydspy_lazy", default=None)
+
+def _force(v: Any):
+    """Resolve ``Lazy`` values, including ones nested in lists/tuples/dicts."""
+    if isinstance(v, Lazy):
+        return v.result()
+    if isinstance(v, list):
+        return [_force(x) for x in v]
+    if isinstance(v, tuple):
+        return tuple(_force(x) for x in v)
+    if isinstance(v, dict):
+        return {k: _force(x) for k, x in v.items()}
+    return v
+
+def _forced_call(fn, a, k):
+    return fn(*_force(a), **_force(k))
+
+class Lazy:
+    """Future returned by a funky call under :func:`lazy`.
+
+    Any use of the value (attribute access, ``str()``, iteration, comparison,
+    arithmetic …) blocks until the call has finished.  ``isinstance`` checks
+    see the proxy, so use :func:`gather` or ``.result()`` when the concrete
+    object is needed.
+    """
+    __slots__ = ("_future",)
+
+    def __init__(self, future: concurrent.futures.Future):
+        object.__setattr__(self, "_future", future)
+
+    def result(self, timeout: float | None = None):
+        return self._future.result(timeout)
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def __getattr__(self, name):
+        return getattr(self.result(), name)
+
+    def __repr__(self):
+        if not self._future.done():
+            return "<Lazy pending>"
+        return repr(self.result())
+
+    def __str__(self):            return str(self.result())
+    def __format__(self, spec):   return format(self.result(), spec)
+    def __bool__(self):           return bool(self.result())
+    def __len__(self):            return len(self.result())
+    def __iter__(self):           return iter(self.result())
+    def __contains__(self, x):    return x in self.result()
+    def __getitem__(self, i):     return self.result()[i]
+    def __hash__(self):           return hash(self.result())
+    def __int__(self):            return int(self.result())
+    def __float__(self):          return float(self.result())
+    def __index__(self):          return self.result().__index__()
+    def __eq__(self, o):          return self.result() == _force(o)
+    def __ne__(self, o):          return self.result() != _force(o)
+    def __lt__(self, o):          return self.result() < _force(o)
+    def __le__(self, o):          return self.result() <= _force(o)
+    def __gt__(self, o):          return self.result() > _force(o)
+    def __ge__(self, o):          return self.result() >= _force(o)
+    def __add__(self, o):         return self.result() + _force(o)
+    def __radd__(self, o):        return _force(o) + self.result()
+    def __sub__(self, o):         return self.result() - _force(o)
+    def __rsub__(self, o):        return _force(o) - self.result()
+    def __mul__(self, o):         return self.result() * _force(o)
+    def __rmul__(self, o):        return _force(o) * self.result()
+    def __truediv__(self, o):     return self.result() / _force(o)
+    def __rtruediv__(self, o):    return _force(o) / self.result()
+
+class _LazyScope:
+    def __init__(self, max_workers: int):
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="funnydspy-lazy")
+
+    def submit(self, fn, a, k) -> Lazy:
+        # Workers run eagerly: a nested lazy call blocking on its own pool
+        # could otherwise starve it.  Dependencies are always submitted before
+        # their dependants, so waiting on them inside a worker is safe.
+        ctx = contextvars.copy_context()
+        ctx.run(_LAZY.set, None)
+        return Lazy(self.pool.submit(ctx.run, _forced_call, fn, a, k))
+
+@contextlib.contextmanager
+def lazy(max_workers: int | None = None):
+    """Make funky calls return :class:`Lazy` futures instead of blocking.
+
+    Independent calls overlap, sharing at most ``max_workers`` threads
+    (default ``dspy.settings.num_threads``).  Futures may be passed straight
+    into other funky calls; the dependant waits for them on dispatch.
+    Leaving the block waits for every outstanding call.
+
+    Example
+    -------
+    ```python
+    with fd.lazy():
+        gists   = [gist_producer(h, c) for c in chunks]   # all in flight
+        headers = header_producer(h, gists)               # waits for gists
+    print(headers)
+    ```
+    """
+    scope = _LazyScope(max_workers or dspy.settings.num_threads or 8)
+    token = _LAZY.set(scope)
+    try:
+        yield scope
+    finally:
+        _LAZY.reset(token)
+        scope.pool.shutdown(wait=True)
+
+def gather(*values):
+    """Wait for every ``Lazy`` in *values* and return the concrete results.
+
+    ``fd.gather(a, b)`` → ``[a_value, b_value]``; a single list argument is
+    treated as the list of values.
+    """
+    if len(values) == 1 and isinstance(values[0], list):
+        values = values[0]
+    return [_force(v) for v in values]
+
+# -----------------------------------------------------------------------------
+# Evaluation harness with prediction caching
+# -----------------------------------------------------------------------------
+
+def _state_hash(mod: dspy.Module, lm=None) -> str:
+    """Stable digest of everything a module's predictions depend on.
+
+    Covers demos, instructions and field specs of every predictor plus the
+    LM in effect (per-predictor ``lm`` or the configured one), so two
+    candidate programs with the same state share cached predictions.
+    """
+    lm = lm or dspy.settings.lm
+    lm_state = lm.dump_state() if hasattr(lm, "dump_state") else repr(lm)
+    state = {
+        "module": mod.dump_state(),
+        "signatures": [f"{n}:{p.signature!r}" for n, p in mod.named_predictors()],
+        "lm": lm_state,
+    }
+    blob = json.dumps(state, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def _lm_id(lm=None) -> str:
+    """Digest of the LM in effect (its ``dump_state``)."""
+    lm = lm or dspy.settings.lm
+    state = lm.dump_state() if hasattr(lm, "dump_state") else repr(lm)
+    return hashlib.sha256(json.dumps(state, sort_keys=True, default=repr).encode()).hexdigest()
+
+def _hash_default(v):
+    # file-backed inputs hash by location + size/mtime, never by reading them
+    if isinstance(v, os.PathLike):
+        v = FileSlice(v)
+    return v.stamp() if isinstance(v, FileSlice) else repr(v)
+
+def _inputs_hash(inputs: dict) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=_hash_default).encode()).hexdigest()
+
+def _program_state(program, mod: dspy.Module | None = None) -> str:
+    """``_state_hash`` of *program*'s module plus its per-call demo pool, if any.
+
+    ``use_demo_pool`` demos are picked per call rather than stored on the
+    module, so the pool's contents and ``k`` join the digest here.
+    """
+    state = _state_hash(getattr(program, "module", program) if mod is None else mod)
+    pool = getattr(program, "demo_index", None)
+    if pool is None:
+        return state
+    return _inputs_hash({"state": state, "pool": pool.digest, "k": program.demo_k})
+
+class EvalRow(typing.NamedTuple):
+    example: Any
+    output: Any          # typed return value (``None`` on error)
+    score: float
+    latency: float       # seconds; ~0 for cache hits
+    cached: bool = False
+    error: BaseException | None = None
+
+class EvalResult(typing.NamedTuple):
+    score: float         # mean metric over the dataset
+    rows: list[EvalRow]
+
+    @property
+    def latencies(self) -> list[float]:
+        return [r.latency for r in self.rows]
+
+_EVAL_CACHE = _LRU(10_000)
+_EVAL_LOCK = threading.Lock()
+
+def _samples(mod: dspy.Module) -> bool:
+    """Does *mod* run on an LM sampling at temperature > 0 (outputs not worth caching)?"""
+    lms = {id(lm): lm for lm in [dspy.settings.lm, *(getattr(p, "lm", None) for p in mod.predictors())] if lm}
+    return any((getattr(lm, "kwargs", None) or {}).get("temperature") or 0 for lm in lms.values())
+
+def evaluate(program, dataset, metric, *, threads: int | None = None, cache: bool | dict = True) -> EvalResult:
+    """Score *program* on *dataset* in parallel, caching predictions.
+
+    Args:
+        program: A funky function, a ``funnier`` wrapper or a raw DSPy module.
+        dataset: ``dspy.Example`` objects (their ``inputs()`` are used when
+            ``with_inputs`` was called) or plain dicts.
+        metric: ``metric(example, output) -> float | bool`` where *output* is
+            the typed return value (a ``dspy.Prediction`` for raw modules).
+        threads: Worker threads (default ``dspy.settings.num_threads``).
+        cache: ``True`` for the process-wide cache (the 10 000 most recently
+            used predictions; skipped when the LM samples at temperature > 0),
+            a dict of your own, or ``False``.  Keys are ``(program-state hash,
+            inputs hash)``, so optimiser candidates with identical
+            demos/instructions never repeat an LM call.
+
+    Returns:
+        ``EvalResult(score, rows)`` with one ``EvalRow`` (output, score,
+        latency, cached, error) per example, in dataset order.
+
+    Example
+    -------
+    ```python
+    res = fd.evaluate(analyse, devset, lambda ex, out: out.count == ex.count, threads=16)
+    print(res.score, max(res.latencies))
+    ```
+    """
+    mod = getattr(program, "module", program)
+    decode = getattr(program, "_decode", None)
+    sig = getattr(program, "signature", None) or getattr(mod, "signature", None)
+    input_names = set(sig.input_fields) if sig is not None else None
+    if cache is True:
+        store = None if _samples(mod) else _EVAL_CACHE
+    else:
+        store = None if cache is False else cache
+    state = _program_state(program, mod) if store is not None else None
+
+    def run(ex) -> EvalRow:
+        data = dict(ex)
+        if isinstance(ex, Example) and ex._input_keys:
+            inputs = dict(ex.inputs())
+        else:
+            inputs = {k: v for k, v in data.items() if input_names is None or k in input_names}
+        key = (state, _inputs_hash(inputs)) if store is not None else None
+        start = time.perf_counter()
+        with _EVAL_LOCK:
+            pred = store.get(key) if key else None
+        cached = pred is not None
+        try:
+            if not cached:
+                if decode is not None:
+                    pred = program(**inputs, _prediction=True)
+                else:
+                    pred = mod(**{k: _to_text(v) for k, v in inputs.items()})
+                if key:
+                    with _EVAL_LOCK:
+                        store[key] = pred
+            out = decode(pred) if decode else pred
+            latency = time.perf_counter() - start
+            return EvalRow(ex, out, float(metric(ex, out)), latency, cached)
+        except Exception as e:
+            return EvalRow(ex, None, 0.0, time.perf_counter() - start, cached, e)
+
+    rows = list(_imap(run, dataset, threads))
+    score = sum(r.score for r in rows) / len(rows) if rows else 0.0
+    return EvalResult(score, rows)
+
+# -----------------------------------------------------------------------------
+# ReAct tools: docments descriptions, memoised and concurrent tool calls
+# -----------------------------------------------------------------------------
+
+def _memo(fn, maxsize: int):
+    """Thread-safe LRU memo of *fn* keyed by the hash of its arguments."""
+    memo: collections.OrderedDict = collections.OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def call(*a, **k):
+        key = _inputs_hash({"args": a, "kwargs": k})
+        with lock:
+            if key in memo:
+                memo.move_to_end(key)
+                return memo[key]
+        out = fn(*a, **k)
+        with lock:
+            memo[key] = out
+            while len(memo) > maxsize:
+                memo.popitem(last=False)
+        return out
+    return call
+
+def tool(fn=None, *, name: str | None = None, cache: bool | int = False):
+    """Mark *fn* as an agent tool for :func:`ReAct`.
+
+    The tool is described by *fn*'s docstring (what it does) and its
+    docments / *Parameters* section (each argument), like funky inputs.
+    ``cache=True`` (or a max size) memoises a deterministic tool by its
+    arguments, across steps and agent runs.
+
+    Example
+    -------
+    ```python
+    @fd.tool(cache=True)
+    def convert(amount: float,  # amount in *from_cur*
+                from_cur: str, to_cur: str) -> float:
+        "Convert between currencies at today's rate."
+    ```
+    """
+    if fn is None:
+        return lambda f: tool(f, name=name, cache=cache)
+    if not (name or cache):
+        return fn
+    wrapped = _memo(fn, 1024 if cache is True else cache) if cache else functools.wraps(fn)(
+        lambda *a, **k: fn(*a, **k))
+    wrapped._tool_name = name or getattr(fn, "_tool_name", None)
+    return wrapped
+
+def _as_tool(t) -> dspy.Tool:
+    if isinstance(t, dspy.Tool):
+        return t
+    descs = {k: v for k, v in _input_descs(inspect.unwrap(t)).items() if v}
+    return dspy.Tool(t, name=getattr(t, "_tool_name", None) or t.__name__,
+                     desc=inspect.getdoc(t) or "", arg_desc=descs or None)
+
+def _parallel_tool(tools: dict[str, dspy.Tool]) -> dspy.Tool:
+    """``run_parallel``: several independent tool calls in one agent step, run concurrently."""
+
+    def one(call):
+        name = call.get("tool_name")
+        try:
+            return tools[name](**(call.get("args") or {}))
+        except Exception as e:  # reported back to the agent like a failed single call
+            return f"Execution error in {name}: {e}"
+
+    def run_parallel(calls: list[dict[str, Any]]) -> list:
+        if not calls:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(calls), 16)) as ex:
+            return list(ex.map(lambda c: contextvars.copy_context().run(one, c), calls))
+
+    return dspy.Tool(
+        run_parallel, name="run_parallel",
+        desc=("Run several independent tool calls at once and get their observations in order. "
+              f"Use it instead of one step per call when no call needs another's result. Tools: {', '.join(tools)}."),
+        arg_desc={"calls": 'list of {"tool_name": ..., "args": {...}}'})
+
+def _as_tools(tools, parallel: bool) -> list[dspy.Tool]:
+    tools = [_as_tool(t) for t in tools]
+    if parallel and len(tools) > 1:
+        tools.append(_parallel_tool({t.name: t for t in tools}))
+    return tools
+
+# -----------------------------------------------------------------------------
+# Incremental recomputation: fd.incremental
+# -----------------------------------------------------------------------------
+
+_INCREMENTAL: contextvars.ContextVar = contextvars.ContextVar("funnydspy_incremental", default=None)
+
+class Step(typing.NamedTuple):
+    fn: str              # signature name of the funky function
+    key: str             # "<program-state hash>:<inputs hash>"
+    parents: tuple       # keys of the steps whose outputs were passed in
+    reused: bool         # served from the store instead of the LM
+
+def _value_hash(v) -> str:
+    return _inputs_hash({"": v})[:16]
+
+def _parts(v):
+    """*v* plus the values it is usually taken apart into downstream."""
+    yield v
+    if isinstance(v, (list, tuple)):
+        yield from v
+    elif isinstance(v, dict):
+        yield from v.values()
+    elif dataclasses.is_dataclass(v) and not isinstance(v, type):
+        yield from (getattr(v, f.name) for f in dataclasses.fields(v))
+    elif isinstance(v, pydantic.BaseModel):
+        yield from (getattr(v, n) for n in type(v).model_fields)
+
+class IncrementalRun:
+    """Bookkeeping of one :func:`incremental` block (see there)."""
+
+    def __init__(self, store, prune: bool = False):
+        self.store = store
+        self.prune = prune
+        self.lock = threading.Lock()
+        self.steps: dict[str, Step] = {}
+        self.producers: dict[str, set[str]] = collections.defaultdict(set)  # value hash → step keys
+        self.states: dict[tuple, str] = {}
+
+    def _state(self, prog) -> str:
+        mod, lm, pool = prog.module, dspy.settings.lm, getattr(prog, "demo_index", None)
+        pool = None if pool is None else (pool.digest, prog.demo_k)
+        memo = (id(mod), _fingerprint(mod), id(lm), pool)
+        with self.lock:
+            state = self.states.get(memo)
+        if state is None:
+            state = _program_state(prog, mod)
+            with self.lock:
+                self.states[memo] = state
+        return state
+
+    def call(self, prog, a, k, compute) -> Prediction:
+        """Prediction of ``prog(*a, **k)``: from the store if its key is there, else ``compute``."""
+        a, k = _force(a), _force(k)
+        inputs = prog._inputs(a, k)
+        key = f"{self._state(prog)}:{_inputs_hash(inputs)}"
+        with self.lock:
+            parents = tuple(sorted({p for v in (*a, *k.values()) for part in _parts(v)
+                                    for p in self.producers.get(_value_hash(part), ())}))
+            entry = self.store.get(key)
+        reused = entry is not None
+        if reused:
+            res = Prediction(**entry["output"])
+        else:
+            res = compute(inputs)
+            entry = {"fn": prog.signature.__name__, "output": dict(res), "parents": list(parents)}
+        with self.lock:
+            self.store[key] = entry  # (re)written so ``prune`` sees it as live
+            self.steps[key] = Step(entry["fn"], key, parents, reused)
+        res._incremental_key = key
+        return res
+
+    def produced(self, res: Prediction, out):
+        """Remember *out* (and its parts) as produced by the step behind *res*."""
+        key = getattr(res, "_incremental_key", None)
+        if key is not None:
+            with self.lock:
+                for part in _parts(out):
+                    self.producers[_value_hash(part)].add(key)
+
+    def lineage(self, value) -> list[Step]:
+        """Steps of this run that *value* (transitively) came from, upstream first."""
+        with self.lock:
+            todo = sorted({k for part in _parts(value) for k in self.producers.get(_value_hash(part), ())})
+            seen: dict[str, Step] = {}
+            while todo:
+                key = todo.pop()
+                if key not in seen and key in self.steps:
+                    seen[key] = self.steps[key]
+                    todo.extend(seen[key].parents)
+        return list(reversed(seen.values()))
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            reused = sum(s.reused for s in self.steps.values())
+            return {"reused": reused, "recomputed": len(self.steps) - reused}
+
+    def _close(self):
+        if self.prune:
+            with self.lock:
+                for key in [k for k in self.store if k not in self.steps]:
+                    del self.store[key]
+
+@contextlib.contextmanager
+def incremental(store=None, *, prune: bool = False):
+    """Serve unchanged funky calls from *store*; recompute only what changed.
+
+    Every funky call in the block is keyed by the program-state hash (demos,
+    instructions, signature, LM) and the hash of its inputs.  A call whose
+    key is in *store* is not sent; a changed upstream output changes the
+    downstream inputs, so exactly the affected calls re-run (and one that
+    re-runs to the same answer invalidates nothing below it).
+
+    Args:
+        store: A dict-like (``MutableMapping``), or a path for an on-disk
+            ``shelve`` kept between runs.  Default: a fresh dict.
+        prune: Drop entries no call in this block used when it ends.
+
+    Yields an :class:`IncrementalRun` with ``stats()`` and
+    ``lineage(value)`` (the ``Step`` records a value was derived from).
+
+    Example
+    -------
+    ```python
+    with fd.incremental("nightly.db", prune=True) as run:
+        gists  = [gist(doc) for doc in corpus]
+        report = summarise(gists)
+    run.stats()    # {'reused': 998, 'recomputed': 3}
+    ```
+    """
+    if store is None:
+        store = {}
+    owned = isinstance(store, (str, os.PathLike))
+    if owned:
+        store = shelve.open(os.fspath(store))
+    run = IncrementalRun(store, prune)
+    token = _INCREMENTAL.set(run)
+    try:
+        yield run
+        run._close()
+    finally:
+        _INCREMENTAL.reset(token)
+        if owned:
+            store.close()
+
+# -----------------------------------------------------------------------------
+# Persistence: fd.save / fd.load / fd.load_dir
+# -----------------------------------------------------------------------------
+
+_FORMAT_VERSION = 1
+_BUILTIN_TYPES = {t.__name__: t for t in (str, int, float, bool, bytes, list, dict, tuple, set, type(None))}
+_GENERIC_ORIGINS = {"list": list, "dict": dict, "tuple": tuple, "set": set, "Union": typing.Union}
+
+def _import_path(obj) -> str:
+    return f"{obj.__module__}:{obj.__qualname__}"
+
+def _import_obj(path: str):
+    mod_name, _, qual = path.partition(":")
+    obj = importlib.import_module(mod_name)
+    for part in qual.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+def _type_to_spec(t):
+    """JSON-able description of an annotation (inverse of ``_spec_to_type``)."""
+    if t is inspect.Signature.empty:
+        return None
+    if t is Ellipsis:
+        return "..."
+    if isinstance(t, type) and _BUILTIN_TYPES.get(t.__name__) is t:
+        return t.__name__
+    origin, args = typing.get_origin(t), typing.get_args(t)
+    if origin is typing.Literal:
+        return {"literal": list(args)}
+    if _is_ndarray(t):
+        dtype, ndim = _ndarray_spec(t)
+        return {"ndarray": dtype.str if dtype is not None else None, "ndim": ndim}
+    if origin is not None:
+        union = origin is typing.Union or type(t).__name__ == "UnionType"  # Optional[X], X | Y
+        name = "Union" if union else getattr(origin, "__name__", "")
+        if name in _GENERIC_ORIGINS:
+            return {"origin": name, "args": [_type_to_spec(a) for a in args]}
+    if t is Any:
+        return "typing:Any"
+    if isinstance(t, type):
+        if "<locals>" not in t.__qualname__:
+            try:
+                if _import_obj(_import_path(t)) is t:
+                    return {"import": _import_path(t)}
+            except (ImportError, AttributeError):
+                pass
+        # not importable: rebuild structurally on load
+        if dataclasses.is_dataclass(t):
+            return {"dataclass": t.__name__,
+                    "fields": [[f.name, _type_to_spec(f.type)] for f in dataclasses.fields(t)]}
+        if _is_model(t):
+            return {"model": t.__name__,
+                    "fields": [[n, _type_to_spec(f.annotation), f.description or ""]
+                               for n, f in t.model_fields.items()]}
+        if issubclass(t, tuple) and hasattr(t, "_fields"):
+            hints = getattr(t, "__annotations__", {})
+            return {"namedtuple": t.__name__,
+                    "fields": [[n, _type_to_spec(hints.get(n, str))] for n in t._fields]}
+    raise TypeError(f"cannot serialise annotation {t!r}")
+
+def _spec_to_type(spec):
+    if spec is None:
+        return inspect.Signature.empty
+    if isinstance(spec, str):
+        return {"typing:Any": Any, "...": Ellipsis}.get(spec) or _BUILTIN_TYPES[spec]
+    if "literal" in spec:
+        return typing.Literal[tuple(spec["literal"])]
+    if "ndarray" in spec:
+        return _ndarray_type(spec["ndarray"], spec["ndim"])
+    if "origin" in spec:
+        args = tuple(_spec_to_type(a) for a in spec["args"])
+        origin = _GENERIC_ORIGINS[spec["origin"]]
+        if origin is typing.Union:
+            return typing.Union[args]
+        return origin[args if len(args) != 1 else args[0]]
+    if "import" in spec:
+        return _import_obj(spec["import"])
+    if "dataclass" in spec:
+        return dataclasses.make_dataclass(spec["dataclass"],
+                                          [(n, _spec_to_type(s)) for n, s in spec["fields"]])
+    if "model" in spec:
+        return pydantic.create_model(spec["model"], **{
+            n: (_spec_to_type(s), pydantic.Field(description=d or None)) for n, s, d in spec["fields"]})
+    if "namedtuple" in spec:
+        return typing.NamedTuple(spec["namedtuple"], [(n, _spec_to_type(s)) for n, s in spec["fields"]])
+    raise ValueError(f"unknown type spec {spec!r}")
+
+def _field_desc(field) -> str:
+    return (field.json_schema_extra or {}).get("desc") or ""
+
+def save(program, path) -> None:
+    """Persist a funky program (or ``funnier`` wrapper / module) to *path*.
+
+    Stores the Signature spec, demos + instructions (``module.dump_state()``)
+    and the return-reconstruction plan as compact JSON, so :func:`load`
+    rebuilds it without re-parsing any source.
+    """
+    mod = getattr(program, "module", program)
+    plan = getattr(mod, "_funky_plan", None) or _ReturnPlan(mod.signature, multi="dict")
+    Sig = plan.signature
+    data = {
+        "funnydspy": _FORMAT_VERSION,
+        "module": _import_path(type(mod)),
+        "signature": {
+            "name": Sig.__name__,
+            "doc": Sig.__doc__,
+            "inputs": [[n, _type_to_spec(f.annotation), _field_desc(f)] for n, f in Sig.input_fields.items()],
+            "outputs": [[n, _type_to_spec(f.annotation), _field_desc(f)] for n, f in Sig.output_fields.items()],
+        },
+        "plan": {"ret": _type_to_spec(plan.ret_ann), "multi": "dict" if plan.kind == "dict" else "example",
+                 "types": {k: _type_to_spec(t) for k, t in plan.outputs.items()
+                           if t is not Sig.output_fields[k].annotation}},
+        "state": mod.dump_state(),
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"), default=repr)
+
+def _materialise(data: dict, name: str):
+    version = data.get("funnydspy")
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"{name!r}: unsupported program format {version!r} "
+                         f"(this funnydspy reads format {_FORMAT_VERSION})")
+    spec = data["signature"]
+    class_dict: dict[str, Any] = {"__annotations__": {}}
+    for fields, Field in ((spec["inputs"], InputField), (spec["outputs"], OutputField)):
+        for field, typ, desc in fields:
+            class_dict[field] = Field(desc=desc)
+            class_dict["__annotations__"][field] = _spec_to_type(typ)
+    if spec["doc"]:
+        class_dict["__doc__"] = spec["doc"]
+    Sig = type(spec["name"], (Signature,), class_dict)
+    mod = _import_obj(data["module"])(Sig)
+    mod.load_state(data["state"])
+    types = {k: _spec_to_type(t) for k, t in data["plan"].get("types", {}).items()}
+    mod._funky_plan = _ReturnPlan(Sig, _spec_to_type(data["plan"]["ret"]), multi=data["plan"]["multi"], types=types)
+    return funnier(mod, alias=name)
+
+class LazyProgram:
+    """A saved program that is read and built on first use.
+
+    Calls, ``.module``, ``.signature`` and ``._decode`` all materialise it
+    (once, thread-safely); until then it costs one path string.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.name = os.path.splitext(os.path.basename(self.path))[0]
+        self._prog = None
+        self._lock = threading.Lock()
+        registry.add(self)
+
+    def materialise(self):
+        if self._prog is None:
+            with self._lock:
+                if self._prog is None:
+                    self._prog = _read(self.path, self.name)
+                    registry.discard(self._prog)  # this handle already represents it
+        return self._prog
+
+    @property
+    def loaded(self) -> bool:
+        return self._prog is not None
+
+    def __call__(self, *a, **k):
+        return self.materialise()(*a, **k)
+
+    def __getattr__(self, name):
+        if name in ("module", "_dspy", "signature", "_decode"):
+            return getattr(self.materialise(), name)
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return f"<funky {self.name} ({'loaded' if self.loaded else 'lazy'})>"
+
+def _read(path, name: str):
+    with open(path, encoding="utf-8") as fh:
+        return _materialise(json.load(fh), name)
+
+def load(path, *, lazy: bool = False):
+    """Load a program written by :func:`save` (a ``funnier``-style callable)."""
+    if lazy:
+        return LazyProgram(path)
+    path = os.fspath(path)  # the built program itself is what fd.registry holds
+    return _read(path, os.path.splitext(os.path.basename(path))[0])
+
+def load_dir(directory, pattern: str = "*.json") -> dict[str, LazyProgram]:
+    """Register every saved program in *directory* lazily, keyed by file stem.
+
+    Nothing is read until a program is first called, so booting a service
+    with hundreds of programs only lists the directory.
+    """
+    import glob
+    return {p.name: p for p in map(LazyProgram, sorted(glob.glob(os.path.join(directory, pattern))))}
+
+# -----------------------------------------------------------------------------
+# Warmup: finish deferred work for every registered program at boot
+# -----------------------------------------------------------------------------
+
+def _warm(prog):
+    prog.module  # noqa: B018 — materialises lazily loaded programs
+    return prog
+
+def warmup(programs=None, *, in_background: bool = False, threads: int | None = None):
+    """Materialise and prepare *programs* (default: everything in ``fd.registry``).
+
+    Lazily loaded programs are read and built, so first requests don't pay
+    for it.  With ``in_background=True`` the work runs on a helper thread and
+    a ``concurrent.futures.Future`` (resolving to the warmed programs) is
+    returned immediately, so a service can start answering readiness probes.
+    """
+    progs = list(registry if programs is None else programs)
+    run = lambda: list(_imap(_warm, progs, threads))  # noqa: E731
+    if not in_background:
+        return run()
+    pool = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="funnydspy-warmup")
+    fut = pool.submit(contextvars.copy_context().run, run)
+    pool.shutdown(wait=False)
+    return fut
+
+# -----------------------------------------------------------------------------
+# kNN demo selection: local BM25 index over a demo pool
+# -----------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"\w+")
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+class DemoIndex:
+    """In-process BM25 index over demos; no network, no extra dependencies.
+
+    Each demo is indexed by the text of its *fields* (input fields,
+    typically).  ``query(inputs, k)`` returns the *k* best-matching demos,
+    ties broken by pool order so prompts stay deterministic.
+
+    Example
+    -------
+    ```python
+    classify.use_demo_pool(trainset, k=3)     # per call: 3 most similar demos
+    ```
+    """
+
+    def __init__(self, pool, fields: list[str], k1: float = 1.5, b: float = 0.75):
+        self.fields = list(fields)
+        self.demos = [d if isinstance(d, Example) else Example(**d) for d in pool]
+        self.k1, self.b = k1, b
+        self.postings: dict[str, list[tuple[int, int]]] = collections.defaultdict(list)
+        self.lengths: list[int] = []
+        for i, demo in enumerate(self.demos):
+            toks = _tokens(self._text(demo))
+            self.lengths.append(len(toks))
+            for term, tf in collections.Counter(toks).items():
+                self.postings[term].append((i, tf))
+        n = len(self.demos)
+        self.avg_len = (sum(self.lengths) / n) if n else 0.0
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+
+    def _text(self, record) -> str:
+        get = record.get if hasattr(record, "get") else (lambda f, d=None: getattr(record, f, d))
+        return " ".join(str(get(f, "")) for f in self.fields)
+
+    def __len__(self):
+        return len(self.demos)
+
+    @functools.cached_property
+    def digest(self) -> str:
+        """Content hash of the indexed demos (part of cache keys, see ``_program_state``)."""
+        return _inputs_hash({"fields": self.fields, "demos": [dict(d) for d in self.demos]})
+
+    def query(self, inputs, k: int = 4) -> list[Example]:
+        """Top-*k* demos for *inputs* (a dict/Example with the indexed fields, or text)."""
+        text = inputs if isinstance(inputs, str) else self._text(inputs)
+        scores: dict[int, float] = collections.defaultdict(float)
+        k1, b, avg = self.k1, self.b, self.avg_len or 1.0
+        for term in set(_tokens(text)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                scores[i] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * self.lengths[i] / avg))
+        best = heapq.nsmallest(k, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [self.demos[i] for i, _ in best]
+
+# -----------------------------------------------------------------------------
+# Hierarchical map-reduce over long documents
+# -----------------------------------------------------------------------------
+
+def _approx_tokens(v: Any) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    text = v if isinstance(v, str) else json.dumps(_to_text(v), default=repr)
+    return len(text) // 4 + 1
+
+def _split_text(text: str, token_budget: int) -> list[str]:
+    """Pack paragraphs into chunks of at most *token_budget* (approx.) tokens."""
+    limit = token_budget * 4
+    chunks, cur = [], ""
+    for para in (p for p in re.split(r"\n\s*\n", text) if p.strip()):
+        while len(para) > limit:                       # oversized paragraph: hard split
+            if cur:
+                chunks.append(cur)
+                cur = ""
+            chunks.append(para[:limit])
+            para = para[limit:]
+        if cur and len(cur) + len(para) + 2 > limit:
+            chunks.append(cur)
+            cur = ""
+        cur = f"{cur}\n\n{para}" if cur else para
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def _fn_id(fn, shared: bool = False) -> str | None:
+    """Cache identity of a map/reduce step, or ``None`` if its nodes must not be cached.
+
+    Funky programs are identified by program state + LM, plain functions by
+    their code plus captured defaults/closure cells (never by name: every
+    lambda is ``<lambda>``).  Globals they call are not tracked, so plain
+    functions stay out of the *shared* process-wide cache.  Other callables
+    are not cached.
+    """
+    mod = getattr(fn, "module", None)
+    if isinstance(mod, dspy.Module):
+        return _program_state(fn, mod)
+    code = getattr(fn, "__code__", None)
+    if code is None or shared:
+        return None
+    captured = [*(fn.__defaults__ or ()), *(fn.__kwdefaults__ or {}).values(),
+                *(c.cell_contents for c in fn.__closure__ or ())]
+    return _inputs_hash({"code": [code.co_code.hex(), repr(code.co_consts), code.co_names],
+                         "captured": [_captured_id(v) for v in captured]})
+
+def _captured_id(v):
+    # plain values by content; anything else (possibly mutable) by identity
+    if isinstance(v, (str, bytes, int, float, bool, type(None))):
+        return v
+    return f"{type(v).__qualname__}@{id(v)}"
+
+def _group(nodes: list, fanout: int, token_budget: int | None) -> list[list]:
+    """Consecutive groups of ≤ *fanout* nodes whose outputs fit *token_budget*.
+
+    A group always takes at least two nodes (when available) so every level
+    shrinks and the tree terminates even if single outputs exceed the budget.
+    """
+    groups, cur, used = [], [], 0
+    for node in nodes:
+        size = node[2]
+        full = len(cur) >= fanout or (token_budget and cur and used + size > token_budget and len(cur) >= 2)
+        if full:
+            groups.append(cur)
+            cur, used = [], 0
+        cur.append(node)
+        used += size
+    if cur:
+        groups.append(cur)
+    return groups
+
+_TREE_CACHE = _LRU(4096)
+_TREE_LOCK = threading.Lock()
+
+def tree_reduce(map_fn, reduce_fn, chunks, *, fanout: int = 8, token_budget: int | None = 4000,
+                threads: int | None = None, cache: bool | dict = True):
+    """Hierarchical map-reduce: map every chunk, then merge level by level.
+
+    Args:
+        map_fn: ``map_fn(chunk) -> partial`` (e.g. a funky gist extractor).
+        reduce_fn: ``reduce_fn(list_of_partials) -> partial``; its output is
+            fed back in at the next level, so it must accept its own results.
+        chunks: A list of chunks, or one long string that is split on blank
+            lines into chunks of about *token_budget* tokens.
+        fanout: Most partials merged by one ``reduce_fn`` call (≥ 2).
+        token_budget: Approximate token cap for a chunk and for the partials
+            merged in one call (``None`` for fanout-only grouping).
+        threads: Worker threads per level (default ``dspy.settings.num_threads``).
+        cache: ``True`` for the process-wide node cache (the 4096 most
+            recently used nodes), a dict of your own, or ``False``.  Leaves
+            are keyed by chunk content and inner nodes by their children's
+            keys, plus the LM in effect and the step's program state, so
+            after a small edit only the changed leaves and their ancestors
+            rerun.  Plain functions (``lambda c: gist(c)``) are keyed by
+            their code and captured values only (not the globals they use),
+            so they are cached only in a dict of your own; other callables
+            never are.
+
+    Returns:
+        The root partial (the mapped chunk itself if there is only one).
+
+    Example
+    -------
+    ```python
+    summary = fd.tree_reduce(gist, merge_gists, open("report.md").read(), fanout=6)
+    ```
+    """
+    if fanout < 2:
+        raise ValueError("tree_reduce needs fanout >= 2")
+    if isinstance(chunks, str):
+        chunks = _split_text(chunks, token_budget or 4000)
+    chunks = list(chunks)
+    if not chunks:
+        raise ValueError("tree_reduce needs at least one chunk")
+    store = _TREE_CACHE if cache is True else (None if cache is False else cache)
+    shared, lm_id = store is _TREE_CACHE, _lm_id()
+    map_id, reduce_id = ((_inputs_hash({"fn": i, "lm": lm_id}) if i is not None else None)
+                         for i in (_fn_id(map_fn, shared), _fn_id(reduce_fn, shared)))
+
+    def node(key: str | None, compute):
+        cached = store is not None and key is not None
+        with _TREE_LOCK:
+            hit = cached and key in store
+            value = store[key] if hit else None
+        if not hit:
+            value = compute()
+            if cached:
+                with _TREE_LOCK:
+                    store[key] = value
+        return key, value, _approx_tokens(value)
+
+    def leaf(chunk):
+        key = _inputs_hash({"map": map_id, "chunk": chunk}) if map_id is not None else None
+        return node(key, lambda: map_fn(chunk))
+
+    def inner(group):
+        if len(group) == 1:                            # odd one out: carried up as is
+            return group[0]
+        children = [k for k, _, _ in group]
+        key = None
+        if reduce_id is not None and None not in children:  # uncached below ⇒ uncached here
+            key = _inputs_hash({"reduce": reduce_id, "children": children})
+        return node(key, lambda: reduce_fn([v for _, v, _ in group]))
+
+    # each node is (key, value, approx tokens); levels run in parallel
+    level = list(_imap(leaf, chunks, threads))
+    while len(level) > 1:
+        level = list(_imap(inner, _group(level, fanout, token_budget), threads))
+    return level[0][1]
+
+# -----------------------------------------------------------------------------
+# File-backed inputs: read at dispatch, released after the call
+# -----------------------------------------------------------------------------
+
+@dataclasses.dataclass(frozen=True)
+class FileSlice:
+    """Byte range ``[start, end)`` of a file, decoded only when a call runs.
+
+    Pass it (or a plain ``pathlib.Path`` / ``mmap.mmap``) wherever a funky
+    function expects text: the bytes are read on the worker right before the
+    LM call and dropped with the call's locals, so a parallel job over a huge
+    corpus holds handles, not contents.
+    """
+    path: str | os.PathLike
+    start: int = 0
+    end: int | None = None
+    encoding: str = "utf-8"
+
+    def read(self) -> str:
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            data = f.read(-1 if self.end is None else max(self.end - self.start, 0))
+        return data.decode(self.encoding, errors="replace")
+
+    def stamp(self) -> tuple:
+        """Identity for caches: path, range and the file's size/mtime."""
+        st = os.stat(self.path)
+        return (os.fspath(self.path), self.start, self.end, st.st_size, st.st_mtime_ns)
+
+    @classmethod
+    def split(cls, path, size: int = 1 << 20, encoding: str = "utf-8") -> list["FileSlice"]:
+        """Cut *path* into slices of about *size* bytes, ending on line breaks.
+
+        Only the bytes around each boundary are touched (via ``mmap``), so
+        splitting a multi-GB file is cheap.
+        """
+        if size < 1:
+            raise ValueError("size must be a positive number of bytes")
+        total = os.path.getsize(path)
+        if total == 0:
+            return []
+        out, start = [], 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while start < total:
+                end = mm.find(b"\n", min(start + size, total) - 1)
+                end = total if end < 0 else end + 1
+                out.append(cls(path, start, end, encoding))
+                start = end
+        return out
+
+def _read_source(v):
+    """Text of a file-backed input (``FileSlice``, path, mmap) or ``None``."""
+    if isinstance(v, FileSlice):
+        return v.read()
+    if isinstance(v, os.PathLike):
+        return FileSlice(v).read()
+    if isinstance(v, mmap.mmap):
+        return v[:].decode("utf-8", errors="replace")
+    return None
+
+def _dispatch(mod):
+    """``mod`` as a callable that makes its inputs LM-safe on the calling thread."""
+    return lambda **inputs: mod(**{k: _to_text(v) for k, v in inputs.items()})
+
+# -----------------------------------------------------------------------------
+# LM cascade: cheap tier first, escalate rejected outputs
+# -----------------------------------------------------------------------------
+
+def _type_ok(v, ann) -> bool:
+    """Did ``_from_text`` actually produce *ann*?  (It returns the raw text on failure.)"""
+    origin = typing.get_origin(ann)
+    if _is_ndarray(ann):
+        return isinstance(v, np.ndarray)
+    if ann is float:
+        return isinstance(v, (int, float)) and not isinstance(v, bool)
+    if ann in (int, bool):
+        return isinstance(v, ann)
+    if _is_model(ann):
+        return isinstance(v, ann)
+    if origin is typing.Literal:
+        return v in typing.get_args(ann)
+    if origin in (list, set) and len(typing.get_args(ann)) == 1:
+        # unconvertible items are kept as they came (``[1, "x"]`` for list[int])
+        return isinstance(v, origin) and all(_type_ok(x, typing.get_args(ann)[0]) for x in v)
+    if origin is dict and len(typing.get_args(ann)) == 2:
+        k_t, v_t = typing.get_args(ann)
+        return isinstance(v, dict) and all(_type_ok(x, k_t) and _type_ok(y, v_t) for x, y in v.items())
+    if origin in (list, dict, tuple, set):
+        return isinstance(v, origin)
+    return True
+
+def _strict_decode(program, pred: Prediction):
+    """Typed value of *pred*, or ``ValueError`` if an output field did not decode."""
+    for k, f in program.signature.output_fields.items():
+        if k in pred and not _type_ok(_from_text(pred[k], f.annotation), f.annotation):
+            raise ValueError(f"output field {k!r} did not decode as {f.annotation!r}")
+    return program._decode(pred)
+
+class _TierStats:
+    """Thread-safe per-tier counters of a cascade."""
+
+    def __init__(self, names: list[str]):
+        self.lock = threading.Lock()
+        self.names = names
+        self.rows = [dict(calls=0, accepted=0, escalated=0, errors=0) for _ in names]
+
+    def bump(self, tier: int, **counts):
+        with self.lock:
+            for k, n in counts.items():
+                self.rows[tier][k] += n
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self.lock:
+            total = self.rows[0]["calls"]
+            return [{"lm": name, **row, "share": row["accepted"] / total if total else 0.0}
+                    for name, row in zip(self.names, self.rows)]
+
+class _CascadeModule(dspy.Module):
+    """Runs a funky program on each tier's LM until an output is accepted.
+
+    ``inner`` is the program's module, so optimisers and ``fd.evaluate``
+    see (and hash) the real predictors; the tier LMs join ``dump_state``.
+    """
+
+    def __init__(self, program, lms: list, accept=None):
+        super().__init__()
+        self.inner = program.module
+        self._program, self._lms, self._accept = program, list(lms), accept
+        self._stats = _TierStats([getattr(lm, "model", None) or repr(lm) for lm in self._lms])
+
+    def dump_state(self, *a, **k):
+        tiers = [lm.dump_state() if hasattr(lm, "dump_state") else repr(lm) for lm in self._lms]
+        return {**super().dump_state(*a, **k), "cascade_tiers": tiers}
+
+    def forward(self, *a, **k):
+        last = len(self._lms) - 1
+        for tier, lm in enumerate(self._lms):
+            self._stats.bump(tier, calls=1)
+            try:
+                with dspy.context(lm=lm):
+                    pred = self._program(*a, _prediction=True, **k)
+                value = _strict_decode(self._program, pred)
+            except Exception:
+                self._stats.bump(tier, errors=1)
+                if tier == last:
+                    raise
+                self._stats.bump(tier, escalated=1)
+                continue
+            if tier == last or self._accept is None or self._accept(value):
+                self._stats.bump(tier, accepted=1)
+                return pred
+            self._stats.bump(tier, escalated=1)
+
+def cascade(fn, lms: list, accept=None):
+    """Try *fn* on the cheapest LM first and escalate only rejected outputs.
+
+    An output is rejected when an output field fails to decode into its
+    annotated type (or the adapter cannot parse it), or when
+    ``accept(value)`` returns false.  The last tier's answer is always
+    returned (its errors propagate).  The wrapper is a drop-in program:
+    ``fd.parallel``, ``fd.evaluate`` and ``fd.lazy`` all run the cascade per
+    item, so a batch only sends its rejects to the next tier.
+
+    Example
+    -------
+    ```python
+    label = fd.cascade(classify, lms=[dspy.LM("openai/gpt-4o-mini"), dspy.LM("openai/gpt-4o")],
+                       accept=lambda out: out.confidence >= 0.7)
+    fd.parallel(label, rows)
+    label.stats()   # [{'lm': 'openai/gpt-4o-mini', 'calls': 100, 'accepted': 91, ..., 'share': 0.91}, ...]
+    ```
+    """
+    if not hasattr(fn, "_decode"):
+        raise TypeError("fd.cascade() needs a funky function or fd.funnier wrapper")
+    if not lms:
+        raise ValueError("fd.cascade() needs at least one LM")
+    mod = _CascadeModule(fn, lms, accept)
+
+    def _call(*a, _prediction: bool = False, **k):
+        if "_prediction" in k:
+            raise TypeError("pass _prediction without the preceding * in positional/keyword mix")
+        scope = _LAZY.get()
+        if scope is not None:
+            return scope.submit(_call, a, {**k, "_prediction": _prediction})
+        pred = mod(*a, **k)
+        return pred if _prediction else fn._decode(pred)
+
+    _call.module = mod
+    _call._dspy = mod
+    _call._decode = fn._decode
+    _call.signature = fn.signature
+    _call.name = f"{getattr(fn, 'name', fn.signature.__name__)}_cascade"
+    _call.stats = mod._stats.snapshot
+    return registry.add(_call)
+
+# -----------------------------------------------------------------------------
+# Hedged requests: duplicate slow calls after an adaptive latency threshold
+# -----------------------------------------------------------------------------
+
+def _spawn(fn, *args) -> concurrent.futures.Future:
+    """``fn(*args)`` on its own daemon thread, in a copy of the current context.
+
+    Hedged and deadline-bound calls may be abandoned while still running; on
+    a shared bounded pool, stuck stragglers would queue every later call
+    behind them, so each attempt gets a thread of its own.
+    """
+    fut: concurrent.futures.Future = concurrent.futures.Future()
+    ctx = contextvars.copy_context()
+
+    def run():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            fut.set_result(ctx.run(fn, *args))
+        except BaseException as e:
+            fut.set_exception(e)
+    threading.Thread(target=run, daemon=True, name="funnydspy-call").start()
+    return fut
+
+def _with_timeout(lm, seconds: float):
+    """*lm* whose requests time out after *seconds* (LMs with a custom engine own their timeouts)."""
+    if lm is None or not isinstance(getattr(lm, "_engine_spec", None), str):
+        return lm
+    return lm.copy(timeout=max(seconds, 0.001))
+
+class Hedge:
+    """Hedging policy: re-send a call that outlives the observed latency percentile.
+
+    Each attempt runs on its own worker thread.  Once *min_samples* latencies
+    are known, a call still running after their *percentile* (never less
+    than *min_delay* seconds) gets one duplicate, sent to *alternate* or the
+    same LM.  The first successful response wins; the loser is cancelled if
+    it has not started and ignored otherwise.  Duplicates are capped at
+    *budget* × calls (0.1 → at most 10 % extra requests).
+
+    Example
+    -------
+    ```python
+    @fd.Predict(hedge=fd.Hedge(percentile=0.9, budget=0.05))
+    def classify(text: str) -> str: return label
+
+    classify("…", _hedge=False)   # per-call opt-out (or ``_hedge=policy``)
+    classify.hedge.stats()        # {'calls': 1000, 'hedged': 48, 'hedge_rate': 0.048, 'win_rate': 0.71, ...}
+    ```
+    """
+
+    def __init__(self, percentile: float = 0.9, budget: float = 0.1, *, alternate=None,
+                 min_delay: float = 0.05, min_samples: int = 20, window: int = 512):
+        self.percentile, self.budget, self.alternate = percentile, budget, alternate
+        self.min_delay, self.min_samples = min_delay, min_samples
+        self.samples: collections.deque = collections.deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.calls = self.hedged = self.wins = 0
+
+    def threshold(self) -> float | None:
+        """Seconds to wait before hedging, or ``None`` while still warming up."""
+        with self.lock:
+            if not self.samples or len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return max(self.min_delay, ordered[int(self.percentile * (len(ordered) - 1))])
+
+    def _observe(self, latency: float):
+        with self.lock:
+            self.samples.append(latency)
+
+    def _try_hedge(self) -> bool:
+        with self.lock:
+            if self.hedged + 1 > self.budget * self.calls:
+                return False
+            self.hedged += 1
+            return True
+
+    def run(self, call, deadline: float | None = None):
+        """``call(lm)`` with hedging; ``lm`` is ``None`` (current LM) or the alternate.
+
+        Waits stop at *deadline* (``time.monotonic()``) with ``DeadlineExceeded``.
+        """
+        with self.lock:
+            self.calls += 1
+        start = time.perf_counter()
+        delay = self.threshold()
+        primary = _spawn(call, None)
+        left = _remaining(deadline)
+        try:
+            res = primary.result(timeout=delay if left is None else min(delay or left, left))
+        except concurrent.futures.TimeoutError:
+            if delay is None or (left is not None and left <= delay):
+                primary.cancel()
+                raise DeadlineExceeded("call missed its deadline") from None
+        else:
+            self._observe(time.perf_counter() - start)
+            return res
+        if not self._try_hedge():
+            res = _await(primary, deadline)
+            self._observe(time.perf_counter() - start)
+            return res
+        backup = _spawn(call, self.alternate)
+        pending = {primary, backup}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=_remaining(deadline),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                for fut in pending:
+                    fut.cancel()
+                raise DeadlineExceeded("call missed its deadline")
+            ok = [f for f in done if f.exception() is None]
+            if ok or not pending:  # first success wins; fail only if both failed
+                fut = ok[0] if ok else primary
+                for loser in pending:
+                    loser.cancel()
+                with self.lock:
+                    self.wins += fut is backup and bool(ok)
+                self._observe(time.perf_counter() - start)
+                return fut.result()
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            calls, hedged, wins = self.calls, self.hedged, self.wins
+        return {"calls": calls, "hedged": hedged, "hedge_wins": wins,
+                "hedge_rate": hedged / calls if calls else 0.0,
+                "win_rate": wins / hedged if hedged else 0.0,
+                "threshold": self.threshold()}
+
+# -----------------------------------------------------------------------------
+# Deadlines: per-call ``_timeout``, ``fd.deadline`` blocks, batch deadlines
+# -----------------------------------------------------------------------------
+
+# absolute ``time.monotonic()`` deadline inherited by every nested funky call
+_DEADLINE: contextvars.ContextVar = contextvars.ContextVar("funnydspy_deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """A funky call did not finish before its deadline."""
+
+@dataclasses.dataclass(frozen=True)
+class TimedOut:
+    """Placeholder for a batch item that missed the deadline (falsy)."""
+    inputs: Any
+
+    def __bool__(self):
+        return False
+
+def _remaining(when: float | None) -> float | None:
+    return None if when is None else max(0.0, when - time.monotonic())
+
+def _await(fut: concurrent.futures.Future, when: float | None):
+    """``fut.result()`` bounded by *when*; the straggler is abandoned (or cancelled if queued)."""
+    try:
+        return fut.result(timeout=_remaining(when))
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        raise DeadlineExceeded("call missed its deadline") from None
+
+@contextlib.contextmanager
+def deadline(seconds: float | None):
+    """Bound every funky call in the block (and calls nested in them) by *seconds*.
+
+    An enclosing, earlier deadline still wins.  Calls that cannot finish in
+    time raise ``DeadlineExceeded``; calls started after it has passed fail
+    without contacting the LM.
+
+    Example
+    -------
+    ```python
+    with fd.deadline(2.0):              # e.g. an HTTP handler's budget
+        topic = classify(text)
+        reply = answer(text, topic)
+    ```
+    """
+    when = None if seconds is None else time.monotonic() + seconds
+    outer = _DEADLINE.get()
+    if outer is not None and (when is None or outer < when):
+        when = outer
+    token = _DEADLINE.set(when)
+    try:
+        yield when
+    finally:
+        _DEADLINE.reset(token)
+
+def _timed(call, inp):
+    start = time.perf_counter()
+    return call(inp), time.perf_counter() - start
+
+def _run_batch(call, inputs_list: list, seconds: float | None = None, num_threads: int | None = None,
+               limiter: "AIMD | None" = None) -> list:
+    """``[call(inp) …]`` on a thread pool, stopping at the deadline.
+
+    At most *num_threads* items are in flight, or ``limiter.limit`` when an
+    ``AIMD`` controller is given; it sees every outcome and may ask for an
+    overloaded item to be retried.  When the deadline hits, queued items
+    are cancelled and running ones abandoned; both come back as
+    ``TimedOut(inputs)``, as do items whose own call timed out.
+    """
+    num_threads = num_threads or dspy.settings.num_threads or 8
+    results: list = [None] * len(inputs_list)
+    finished = [False] * len(inputs_list)
+    queue = collections.deque(range(len(inputs_list)))
+    tries = collections.Counter()
+    running: dict = {}
+    with deadline(seconds) as when:
+        pool = concurrent.futures.ThreadPoolExecutor(limiter.max_limit if limiter else num_threads,
+                                                     thread_name_prefix="funnydspy-batch")
+        try:
+            while queue or running:
+                while queue and len(running) < (limiter.limit if limiter else num_threads):
+                    i = queue.popleft()
+                    fut = pool.submit(contextvars.copy_context().run, _timed, call, inputs_list[i])
+                    running[fut] = (i, limiter.acquire() if limiter else None)
+                done, _ = concurrent.futures.wait(running, timeout=_remaining(when),
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                if not done:
+                    break  # deadline
+                for fut in done:
+                    i, ticket = running.pop(fut)
+                    exc = fut.exception()
+                    if exc is None:
+                        results[i], latency = fut.result()
+                        finished[i] = True
+                        if limiter:
+                            limiter.record(ticket, latency=latency)
+                    elif isinstance(exc, DeadlineExceeded):
+                        if limiter:
+                            limiter.release(ticket)
+                    elif limiter and limiter.record(ticket, error=exc) and tries[i] < limiter.max_retries:
+                        tries[i] += 1
+                        queue.append(i)  # overload: retry once the limit allows
+                    else:
+                        raise exc
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if limiter:  # abandoned at the deadline or by an error: free their slots
+                for _, ticket in running.values():
+                    limiter.release(ticket)
+    return [r if ok else TimedOut(inp) for r, ok, inp in zip(results, finished, inputs_list)]
+
+# -----------------------------------------------------------------------------
+# Adaptive concurrency (AIMD) for parallel batches
+# -----------------------------------------------------------------------------
+
+try:  # DSPy's classified provider failures (3.4+)
+    from dspy.utils.exceptions import LMRateLimitError, LMServerError, LMTimeoutError, LMTransportError
+    _OVERLOAD_ERRORS: tuple = (LMRateLimitError, LMServerError, LMTimeoutError, LMTransportError)
+except ImportError:
+    _OVERLOAD_ERRORS = ()
+
+def _is_overload(exc: BaseException) -> bool:
+    """429s, 5xx and transport timeouts: signs the provider wants less traffic."""
+    if isinstance(exc, DeadlineExceeded):
+        return False
+    if isinstance(exc, _OVERLOAD_ERRORS):
+        return True
+    status = (getattr(exc, "status", None) or getattr(exc, "status_code", None)
+              or getattr(getattr(exc, "response", None), "status_code", None))
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    return isinstance(exc, TimeoutError) or "RateLimit" in type(exc).__name__
+
+class AIMD:
+    """Additive-increase / multiplicative-decrease limit on in-flight calls.
+
+    Every healthy response grows the limit by ``increase / limit`` (about
+    +``increase`` per round of requests).  A 429, 5xx or transport timeout,
+    or a latency above ``latency_factor`` × the running average, multiplies
+    it by ``decrease``, at most once per round: responses to requests sent
+    before the last cut are not counted again.  Overloaded items are retried
+    up to ``max_retries`` times.  ``stats()`` and ``decisions`` show what it
+    did; one controller can be shared by several batches.
+
+    Example
+    -------
+    ```python
+    ctl = fd.AIMD(initial=8, max_limit=64)
+    labels = fd.parallel(classify, rows, concurrency=ctl)
+    ctl.stats()   # {'limit': 23, 'in_flight': 0, 'increases': 15, 'decreases': 2, ...}
+    ```
+    """
+
+    def __init__(self, initial: int = 4, *, min_limit: int = 1, max_limit: int = 64,
+                 increase: float = 1.0, decrease: float = 0.5, latency_factor: float = 2.0,
+                 max_retries: int = 5, history: int = 256):
+        self.min_limit, self.max_limit = min_limit, max_limit
+        self.increase, self.decrease, self.latency_factor = increase, decrease, latency_factor
+        self.max_retries = max_retries
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.lock = threading.Lock()
+        self.epoch = 0
+        self.in_flight = self.successes = self.errors = 0
+        self.increases = self.decreases = 0
+        self.baseline: float | None = None   # EWMA of healthy latencies
+        self.samples = 0
+        self.decisions: collections.deque = collections.deque(maxlen=history)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> int:
+        """Ticket (the current round) for a request about to be sent."""
+        with self.lock:
+            self.in_flight += 1
+            return self.epoch
+
+    def release(self, ticket) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    def _decide(self, action: str, reason: str):
+        self.decisions.append((time.time(), action, self.limit, reason))
+
+    def _cut(self, ticket, reason: str):
+        if ticket != self.epoch:
+            return  # already backed off for this round
+        self._limit = max(self.min_limit, self._limit * self.decrease)
+        self.epoch += 1
+        self.decreases += 1
+        self._decide("decrease", reason)
+
+    def record(self, ticket, *, latency: float | None = None, error: BaseException | None = None) -> bool:
+        """Feed one outcome back; ``True`` if it was an overload error (worth a retry)."""
+        with self.lock:
+            self.in_flight -= 1
+            if error is not None:
+                self.errors += 1
+                if not _is_overload(error):
+                    return False
+                self._cut(ticket, type(error).__name__)
+                return True
+            self.successes += 1
+            spike = (self.baseline is not None and self.samples >= 5
+                     and latency > self.latency_factor * self.baseline)
+            self.samples += 1
+            self.baseline = latency if self.baseline is None else 0.9 * self.baseline + 0.1 * latency
+            if spike:
+                self._cut(ticket, f"latency {latency:.2f}s")
+                return False
+            before = self.limit
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            if self.limit > before:
+                self.increases += 1
+                self._decide("increase", "healthy")
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return {"limit": self.limit, "in_flight": self.in_flight, "successes": self.successes,
+                    "errors": self.errors, "increases": self.increases,
+                    "decreases": self.decreases, "baseline_latency": self.baseline}
+
+# -----------------------------------------------------------------------------
+# LM pools: spread parallel work over several endpoints
+# -----------------------------------------------------------------------------
+
+def _is_endpoint_fault(exc: BaseException) -> bool:
+    """Errors that say something about the endpoint (not about the prompt)."""
+    return _is_overload(exc) or isinstance(exc, ConnectionError) or "Connection" in type(exc).__name__
+
+class _Endpoint:
+    def __init__(self, lm, weight: float, limit: int | None):
+        self.lm, self.weight, self.limit = lm, weight, limit
+        self.outstanding = self.peak = self.requests = self.failures = self.streak = 0
+        self.ejected_until = 0.0
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+    def has_slot(self) -> bool:
+        return self.limit is None or self.outstanding < self.limit
+
+class LMPool:
+    """Several LMs (keys, regions, replicas) serving the same model.
+
+    Each request goes to the healthy endpoint with the fewest outstanding
+    requests relative to its *weight*, never exceeding its *limit* (callers
+    wait for a slot).  After *eject_after* consecutive endpoint faults
+    (429/5xx, timeouts, connection errors) an endpoint is ejected for
+    *cooldown* seconds and the request is retried elsewhere; after the
+    cooldown it gets traffic again and one more fault ejects it anew.
+
+    Example
+    -------
+    ```python
+    pool = fd.LMPool().add(dspy.LM("openai/gpt-4o-mini", api_key=k1), weight=2, limit=32)
+    pool.add(dspy.LM("openai/gpt-4o-mini", api_base=vllm_url), limit=8)
+    labels = fd.parallel(classify, rows, lms=pool)     # 40 threads, spread over both
+    pool.stats()
+    ```
+    """
+
+    def __init__(self, lms=(), *, eject_after: int = 3, cooldown: float = 30.0):
+        self.endpoints: list[_Endpoint] = []
+        self.eject_after, self.cooldown = eject_after, cooldown
+        self.cond = threading.Condition()
+        for lm in lms:
+            self.add(lm)
+
+    def add(self, lm, *, weight: float = 1.0, limit: int | None = None) -> "LMPool":
+        with self.cond:
+            self.endpoints.append(_Endpoint(lm, weight, limit))
+        return self
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    @property
+    def capacity(self) -> int | None:
+        """Sum of the endpoint limits (``None`` if any endpoint is unlimited)."""
+        limits = [e.limit for e in self.endpoints]
+        return None if not limits or None in limits else sum(limits)
+
+    def _acquire(self, tried: set) -> _Endpoint:
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                fresh = [e for e in self.endpoints if e not in tried]
+                if not fresh:
+                    raise LookupError("every endpoint in the pool failed this request")
+                healthy = [e for e in fresh if e.ejected_until <= now] or fresh  # all ejected: try anyway
+                ready = [e for e in healthy if e.has_slot()]
+                if ready:
+                    ep = min(ready, key=_Endpoint.load)
+                    ep.outstanding += 1
+                    ep.requests += 1
+                    ep.peak = max(ep.peak, ep.outstanding)
+                    return ep
+                self.cond.wait()
+
+    def _release(self, ep: _Endpoint, exc: BaseException | None):
+        with self.cond:
+            ep.outstanding -= 1
+            if exc is None:
+                ep.streak = 0
+            elif _is_endpoint_fault(exc):
+                ep.failures += 1
+                ep.streak += 1
+                if ep.streak >= self.eject_after:
+                    ep.ejected_until = time.monotonic() + self.cooldown
+                    ep.streak = self.eject_after - 1  # back on probation after the cooldown
+            self.cond.notify_all()
+
+    def call(self, fn):
+        """Run ``fn()`` with ``dspy.context(lm=…)`` set to a pool endpoint."""
+        tried: set = set()
+        while True:
+            ep = self._acquire(tried)
+            try:
+                with dspy.context(lm=ep.lm):
+                    res = fn()
+            except Exception as e:
+                self._release(ep, e)
+                tried.add(ep)
+                if not _is_endpoint_fault(e) or len(tried) == len(self.endpoints):
+                    raise
+                continue
+            self._release(ep, None)
+            return res
+
+    def stats(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        with self.cond:
+            return [{"lm": getattr(e.lm, "model", None) or repr(e.lm), "weight": e.weight, "limit": e.limit,
+                     "outstanding": e.outstanding, "peak": e.peak, "requests": e.requests,
+                     "failures": e.failures, "ejected": e.ejected_until > now}
+                    for e in self.endpoints]
+
+# -----------------------------------------------------------------------------
+# Output parsing: near-miss Literal/Enum labels, pydantic models via TypeAdapter
+# -----------------------------------------------------------------------------
+
+def _is_label_type(ann) -> bool:
+    return typing.get_origin(ann) is typing.Literal or (isinstance(ann, type) and issubclass(ann, enum.Enum))
+
+def _norm_label(text: str) -> str:
+    return " ".join(re.sub(r"[\W_]+", " ", text.casefold()).split())
+
+# words that flip an answer's meaning: "not positive" must never become "positive"
+_NEGATIONS = frozenset("not no never neither nor non without cannot isn aren wasn weren don doesn didn "
+                       "hasn haven won wouldn shouldn couldn".split())
+
+class _LabelIndex:
+    """Lookup from LM text to a label: exact, normalised, contained, then fuzzy.
+
+    Normalisation case-folds and drops punctuation/extra whitespace; a
+    normalised answer that contains exactly one label as whole words maps to
+    it; otherwise ``difflib`` picks the nearest label above *cutoff*.  The
+    last two steps refuse answers with a negation the label itself lacks.
+    Tables only: match counts are kept per program (``_LabelStats``).
+    """
+
+    def __init__(self, ann, cutoff: float = 0.75):
+        if typing.get_origin(ann) is typing.Literal:
+            pairs = [(str(v), v) for v in typing.get_args(ann)]
+        else:
+            pairs = [(m.name, m) for m in ann] + [(str(m.value), m) for m in ann]
+        self.exact = dict(reversed(pairs))          # first spelling wins
+        self.normalised = {}
+        for text, label in pairs:
+            self.normalised.setdefault(_norm_label(text), label)
+        self.cutoff = cutoff
+
+    def lookup(self, value) -> tuple[str, Any]:
+        """``(kind, label)``: how *value* matched (``("miss", None)`` if it did not)."""
+        text = value.strip() if isinstance(value, str) else str(value)
+        if text in self.exact:
+            return "exact", self.exact[text]
+        key = _norm_label(text)
+        if key in self.normalised:
+            return "normalised", self.normalised[key]
+        negations = _NEGATIONS.intersection(key.split())
+        padded = f" {key} "
+        inside = {k: label for k, label in self.normalised.items() if k and f" {k} " in padded}
+        if len({id(label) for label in inside.values()}) == 1:
+            k, label = next(iter(inside.items()))
+            if not negations - set(k.split()):
+                return "contained", label
+        near = difflib.get_close_matches(key, list(self.normalised), n=1, cutoff=self.cutoff)
+        if near and not negations - set(near[0].split()):
+            return "fuzzy", self.normalised[near[0]]
+        return "miss", None
+
+    def match(self, value, field: str | None = None):
+        """The label *value* stands for; ``ValueError`` if nothing is close enough.
+
+        The outcome is counted for *field* in the calling program's stats.
+        """
+        kind, label = self.lookup(value)
+        stats = _LABEL_STATS.get()
+        if stats is not None and field is not None:
+            stats.bump(field, kind)
+        if kind == "miss":
+            raise ValueError(f"{value!r} is not one of {list(self.exact)}")
+        return label
+
+_LABEL_STATS: contextvars.ContextVar = contextvars.ContextVar("funnydspy_label_stats", default=None)
+
+class _LabelStats:
+    """Thread-safe per-field counters of how label answers matched, one per program."""
+    KINDS = ("exact", "normalised", "contained", "fuzzy", "miss")
+
+    def __init__(self, fields: list[str]):
+        self.lock = threading.Lock()
+        self.counts = {k: collections.Counter() for k in fields}
+
+    def bump(self, field: str, kind: str):
+        with self.lock:
+            if field in self.counts:
+                self.counts[field][kind] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self.lock:
+            return {f: {k: c[k] for k in self.KINDS} for f, c in self.counts.items()}
+
+@functools.lru_cache(maxsize=1024)
+def _label_index(ann) -> _LabelIndex:
+    return _LabelIndex(ann)
+
+@functools.lru_cache(maxsize=1024)
+def _model_parser(ann):
+    """Strict text → *ann* for pydantic-bearing fields, via the cached ``TypeAdapter``."""
+    validate = _coercer(ann)
+
+    def parse(value):
+        try:
+            return validate(value)  # JSON parse + validation in a single pydantic-core pass
+        except pydantic.ValidationError:
+            if not isinstance(value, str):
+                raise
+            return validate(json_repair.loads(value))  # fenced / trailing commas / single quotes
+    return parse
+
+def _field_parser(ann):
+    """Our parser for an output field the adapter should leave as text, else ``None``."""
+    if _is_label_type(ann):
+        return _label_index(ann).match
+    if _has_model(ann):
+        return _model_parser(ann)
+    return None
+
+_FIELD_PARSERS: "weakref.WeakKeyDictionary[type, dict]" = weakref.WeakKeyDictionary()
+
+def _field_parsers(signature: type[Signature]) -> dict[str, Any]:
+    """``{output field: parser}`` for *signature*, built once per signature."""
+    parsers = _FIELD_PARSERS.get(signature)
+    if parsers is None:
+        parsers = {k: functools.partial(p, field=k) if _is_label_type(f.annotation) else p
+                   for k, f in signature.output_fields.items() if (p := _field_parser(f.annotation))}
+        _FIELD_PARSERS[signature] = parsers
+    return parsers
+
+_RELAXED_SIGNATURES: "weakref.WeakKeyDictionary[type, type]" = weakref.WeakKeyDictionary()
+
+def _relaxed(signature: type[Signature], names) -> type[Signature]:
+    """*signature* with the *names* fields typed ``str`` (parsing only; prompts keep the real types)."""
+    relaxed = _RELAXED_SIGNATURES.get(signature)
+    if relaxed is None:
+        relaxed = signature
+        for name in names:
+            relaxed = relaxed.with_updated_fields(name, type_=str)
+        _RELAXED_SIGNATURES[signature] = relaxed
+    return relaxed
+
+class _FieldParseMixin:
+    """Adapter mixin: parse label and pydantic fields ourselves (see ``_field_parser``).
+
+    The prompt still lists the allowed labels / JSON schema; only parsing
+    changes.  ``Literal``/``Enum`` answers such as "Positive." or "positve"
+    map onto ``"positive"`` instead of a parse error (and a retry); model
+    fields are decoded by a ``TypeAdapter`` compiled once per annotation.
+    Answers that still do not fit raise ``AdapterParseError``.
+    """
+
+    def parse(self, signature, completion):
+        parsers = _field_parsers(signature)
+        if not parsers:
+            return super().parse(signature, completion)
+        fields = super().parse(_relaxed(signature, parsers), completion)
+        for name, parse in parsers.items():
+            if name in fields:
+                try:
+                    fields[name] = parse(fields[name])
+                except ValueError as e:
+                    raise AdapterParseError(adapter_name=type(self).__name__, signature=signature,
+                                            lm_response=completion, message=str(e)) from None
+        return fields
+
+# -----------------------------------------------------------------------------
+# NumPy: ndarray outputs and columnar batch results (numpy is optional)
+# -----------------------------------------------------------------------------
+
+def _is_ndarray(t) -> bool:
+    return np is not None and (t is np.ndarray or typing.get_origin(t) is np.ndarray)
+
+def _ndarray_spec(t) -> tuple[Any, int | None]:
+    """``(dtype | None, ndim | None)`` of ``np.ndarray[shape, np.dtype[T]]`` / ``NDArray[T]``."""
+    dtype = ndim = None
+    args = typing.get_args(t)
+    if len(args) == 2:
+        shape, dt = args
+        scalar = typing.get_args(dt)
+        if scalar and isinstance(scalar[0], type) and issubclass(scalar[0], np.generic):
+            dtype = np.dtype(scalar[0])
+        dims = typing.get_args(shape)
+        if dims and Ellipsis not in dims:
+            ndim = len(dims)
+    return dtype, ndim
+
+def _ndarray_type(dtype: str | None, ndim: int | None):
+    """Rebuild an ndarray annotation from ``_ndarray_spec`` parts (persistence)."""
+    if np is None:
+        raise ImportError("this program returns numpy arrays; install numpy to load it")
+    shape = tuple[(int,) * ndim] if ndim else tuple[Any, ...]
+    return np.ndarray[shape, np.dtype[np.dtype(dtype).type if dtype else Any]]
+
+def _ndarray_lm_type(t):
+    """The (nested) list type an ndarray output is requested as from the LM."""
+    dtype, ndim = _ndarray_spec(t)
+    item = {"b": bool, "i": int, "u": int}.get(dtype.kind if dtype is not None else "f", float)
+    for _ in range(ndim or 1):
+        item = list[item]
+    return item
+
+_COLUMN_DTYPES = {float: "float64", int: "int64", bool: "bool"}
+
+class Columns(dict):
+    """``fd.parallel(..., as_columns=True)`` result: one column per output field.
+
+    Numeric fields are NumPy arrays, ndarray fields are stacked when their
+    shapes agree, anything else is a list.  ``ok`` marks the rows that
+    produced a value; failed rows hold ``nan`` (float), ``0``/``False`` or
+    ``None``.
+    """
+    ok: "np.ndarray"
+
+def _plan_of(func) -> "_ReturnPlan":
+    """The return plan behind a funky / funnier / cascade program."""
+    if isinstance(getattr(func, "_decode", None), _ReturnPlan):
+        return func._decode
+    mod = func.module
+    return (getattr(mod, "_funky_plan", None) or getattr(getattr(mod, "inner", None), "_funky_plan", None)
+            or _ReturnPlan(mod.signature, multi="dict"))
+
+def _columns(plan: "_ReturnPlan", preds: list) -> Columns:
+    """Write each prediction's fields straight into per-field columns."""
+    if np is None:
+        raise ImportError("as_columns=True needs numpy")
+    n = len(preds)
+    ok = np.fromiter((isinstance(p, Prediction) for p in preds), bool, n)
+    cols = Columns()
+    for k, typ in plan.outputs.items():
+        name = plan.raw.get(k, k) if plan.kind in ("dataclass", "model") else k
+        dtype = _COLUMN_DTYPES.get(typ)
+        if dtype is not None:
+            col = np.full(n, np.nan) if dtype == "float64" else np.zeros(n, dtype)
+            for i in np.flatnonzero(ok):
+                try:
+                    value = _from_text(preds[i][k], typ)
+                except (TypeError, ValueError):
+                    value = None
+                if _type_ok(value, typ):
+                    col[i] = value
+                else:  # raw text / 3.7 for an int column: never cast it silently
+                    ok[i] = False
+        else:
+            col = [_from_text(p[k], typ) if good else None for p, good in zip(preds, ok)]
+            if _is_ndarray(typ) and ok.all():
+                try:
+                    col = np.stack(col)
+                except ValueError:
+                    pass  # ragged: keep the list of arrays
+        cols[name] = col
+    cols.ok = ok
+    return cols
+
 # -----------------------------------------------------------------------------
 # Enhanced function wrapper with parallel support
 # -----------------------------------------------------------------------------
@@ -0,0 +1,51 @@
+"""Shared fixtures: a thread-safe stand-in LM so tests never hit the network."""
+
+import threading
+import time
+
+import pytest
+from dspy.clients.engines.dummy_engine import AsyncDummyEngine, DummyEngine
+from dspy.lm15 import Message, Response, TextPart, Usage
+from dspy.utils import DummyLM
+
+
+class _StandInEngine(DummyEngine):
+    def _complete_messages(self, messages):
+        owner = self.owner
+        with owner._lock:
+            owner.calls += 1
+            owner.prompts.append(messages)
+        delay = owner.delay(messages[-1]["content"]) if callable(owner.delay) else owner.delay
+        if delay:
+            time.sleep(delay)
+        output = owner._format_answer_fields(owner.respond(messages[-1]["content"]))
+        return Response(id=None, model=owner.model, message=Message.assistant([TextPart(output)]),
+                        finish_reason="stop", usage=Usage(**(owner.usage or {"input_tokens": 0, "output_tokens": 0,
+                                                                              "total_tokens": 0})))
+
+
+class StandInLM(DummyLM):
+    """DummyLM whose answer is computed from the last user message.
+
+    ``respond(prompt) -> dict[field, value]``; ``delay`` is seconds (or a
+    callable of the prompt) slept before answering; ``usage`` holds
+    ``dspy.lm15.Usage`` fields to report.  Safe to share across threads;
+    ``calls`` counts requests and ``prompts`` keeps the messages sent.
+    """
+
+    def __init__(self, respond, delay=0.0, model="dummy", usage=None):
+        super().__init__({})
+        self.model = model
+        self.usage = usage
+        self.respond = respond
+        self.delay = delay
+        self.calls = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+        self._engine_spec = _StandInEngine(self)
+        self._async_engine_spec = AsyncDummyEngine(self._engine_spec)
+
+
+@pytest.fixture
+def stand_in_lm():
+    return StandInLM
@@ -0,0 +1,78 @@
+"""Tests for adaptive concurrency (``fd.AIMD``) in parallel batches."""
+
+import threading
+import time
+
+import pytest
+
+import funnydspy as fd
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def _server(capacity):
+    """A fake endpoint that answers 429 above *capacity* concurrent requests."""
+    state = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work(x):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+            over = state["now"] > capacity
+        try:
+            if over:
+                raise RateLimitError("slow down")
+            time.sleep(0.005)
+            return x * 2
+        finally:
+            with lock:
+                state["now"] -= 1
+
+    return work, state
+
+
+def test_limit_backs_off_on_429_and_items_are_retried():
+    work, _ = _server(capacity=4)
+    ctl = fd.AIMD(initial=2, max_limit=32, max_retries=20)
+    out = fd.parallelize(work, concurrency=ctl)([{"x": i} for i in range(200)])
+    assert out == [i * 2 for i in range(200)]
+    stats = ctl.stats()
+    assert stats["increases"] > 0 and stats["decreases"] > 0
+    assert stats["limit"] <= 8 and stats["in_flight"] == 0
+    assert {d[1] for d in ctl.decisions} == {"increase", "decrease"}
+
+
+def test_non_overload_errors_propagate():
+    def boom(x):
+        raise ValueError(x)
+
+    with pytest.raises(ValueError):
+        fd.parallelize(boom, concurrency=fd.AIMD())([{"x": 1}])
+
+
+def test_abandoned_items_give_their_slots_back():
+    def work(x):
+        if x == 0:
+            raise ValueError(x)
+        time.sleep(0.2 if x == 1 else 0)
+        return x
+
+    ctl = fd.AIMD(initial=4)
+    with pytest.raises(ValueError):
+        fd.parallelize(work, concurrency=ctl)([{"x": i} for i in range(4)])
+    assert ctl.stats()["in_flight"] == 0
+    out = fd.parallelize(lambda x: time.sleep(x) or x, timeout=0.1, concurrency=ctl)([{"x": 0}, {"x": 0.5}])
+    assert out[1] == fd.TimedOut({"x": 0.5}) and ctl.stats()["in_flight"] == 0
+
+
+def test_latency_spike_cuts_the_limit():
+    ctl = fd.AIMD(initial=10)
+    for _ in range(10):
+        ctl.record(ctl.acquire(), latency=0.1)
+    before = ctl.limit
+    ctl.record(ctl.acquire(), latency=1.0)
+    assert ctl.limit == before // 2
+    assert ctl.decisions[-1][1:] == ("decrease", ctl.limit, "latency 1.00s")
@@ -0,0 +1,106 @@
+"""Tests for memoised decoration and the pipe module cache."""
+
+import gc
+import inspect
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+import dspy
+
+import funnydspy as fd
+
+
+def _make_classifier(labels):
+    @fd.ChainOfThought
+    def classifier(chunk: str) -> Literal[tuple(labels)]:
+        return topic
+    return classifier
+
+
+def test_redecoration_is_memoised(monkeypatch):
+    first = _make_classifier(["a", "b"])
+    calls = []
+    real = inspect.getsource
+    monkeypatch.setattr(inspect, "getsource", lambda obj: calls.append(obj) or real(obj))
+    for _ in range(50):
+        again = _make_classifier(["a", "b"])
+    assert again is first
+    assert again.module is first.module
+    assert calls == []
+
+
+def test_different_annotations_get_different_programs():
+    ab = _make_classifier(["a", "b"])
+    cd = _make_classifier(["c", "d"])
+    assert ab is not cd
+    assert ab.signature.output_fields["topic"].annotation == Literal["a", "b"]
+    assert cd.signature.output_fields["topic"].annotation == Literal["c", "d"]
+
+
+def test_module_class_is_part_of_the_key():
+    def f(x: str) -> str:
+        return y
+    assert fd.Predict(f) is not fd.ChainOfThought(f)
+
+
+def _pipe_sig(i):
+    return type(f"Sig{i}", (dspy.Signature,), {"__annotations__": {"text": str, "out": int},
+                                               "text": dspy.InputField(), "out": dspy.OutputField()})
+
+
+def test_pipe_module_cache_is_bounded_and_counts():
+    cache = fd._ModuleCache(dspy.Predict, maxsize=2)
+    sigs = [_pipe_sig(i) for i in range(3)]
+    first = cache.get(sigs[0])
+    assert cache.get(sigs[0]) is first
+    cache.get(sigs[1])
+    cache.get(sigs[2])
+    info = cache.info()
+    assert (info["hits"], info["misses"], info["evictions"], info["size"]) == (1, 3, 1, 2)
+    assert first.inputs == {"text"} and first.decoders == {"out": int}
+
+
+def test_pipe_module_cache_builds_once_under_contention():
+    built = []
+
+    def slow_factory(sig):
+        built.append(sig)
+        time.sleep(0.05)
+        return dspy.Predict(sig)
+
+    cache = fd._ModuleCache(slow_factory)
+    sig = _pipe_sig("x")
+    with ThreadPoolExecutor(16) as pool:
+        mods = {id(e.mod) for e in pool.map(lambda _: cache.get(sig), range(64))}
+    assert len(built) == 1 and len(mods) == 1
+
+
+def test_pipe_module_cache_does_not_pin_signatures():
+    cache = fd._ModuleCache(dspy.Predict)
+    sig = _pipe_sig("gone")
+    cache.get(sig)
+    ref = weakref.ref(sig)
+    del sig
+    gc.collect()
+    assert ref() is None
+    assert cache.info()["size"] == 0
+
+
+def test_changed_comments_are_not_served_from_the_memo():
+    import linecache
+    ns = {"fd": fd}
+
+    def cell(n, comment):  # a notebook re-run: same code, new cell, edited docment
+        src = f"@fd.Predict\ndef ask(question: str,  # {comment}\n        ) -> str:\n    return answer\n"
+        name = f"<cell-{n}>"
+        linecache.cache[name] = (len(src), None, src.splitlines(True), name)
+        exec(compile(src, name, "exec"), ns)
+        return ns["ask"]
+
+    first = cell(1, "the user's question")
+    assert cell(2, "the user's question") is first
+    edited = cell(3, "a yes/no question")
+    assert edited is not first
+    assert edited.signature.input_fields["question"].json_schema_extra["desc"] == "a yes/no question"
@@ -0,0 +1,41 @@
+"""Tests for ``fd.cascade`` (cheap LM first, escalate rejected outputs)."""
+
+import re
+
+import dspy
+import pytest
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def score(text: str) -> int:
+    return points
+
+
+def _number(prompt):
+    return re.search(r"\[\[ ## text ## \]\]\n(\w+)", prompt).group(1)
+
+
+def test_rejects_escalate_to_the_next_tier():
+    # the cheap tier answers "lots" for odd items: not an int
+    cheap = StandInLM(lambda p: {"points": _number(p) if int(_number(p)) % 2 == 0 else "lots"}, model="cheap")
+    strong = StandInLM(lambda p: {"points": _number(p)}, model="strong")
+    tiered = fd.cascade(score, lms=[cheap, strong], accept=lambda v: v != 4)
+
+    out = fd.parallel(tiered, [{"text": str(i)} for i in range(10)])
+    assert out == list(range(10))
+    assert cheap.calls == 15                     # odd items also hit the JSON-adapter fallback
+    assert strong.calls == 6                     # 5 odd + the vetoed 4
+    first, second = tiered.stats()
+    assert (first["lm"], first["accepted"], first["escalated"]) == ("cheap", 4, 6)
+    assert (second["lm"], second["calls"], second["accepted"]) == ("strong", 6, 6)
+    assert first["share"] == pytest.approx(0.4)
+
+
+def test_last_tier_answer_is_returned_even_if_vetoed():
+    only = StandInLM(lambda p: {"points": "7"})
+    tiered = fd.cascade(score, lms=[only], accept=lambda v: False)
+    assert tiered("x") == 7
+    assert tiered("x", _prediction=True).points == 7
@@ -0,0 +1,84 @@
+"""Stress tests: many threads calling one funky program concurrently."""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.ChainOfThought
+def echo(token: str) -> str:
+    return same
+
+
+def _respond(prompt):
+    tok = re.search(r"\[\[ ## token ## \]\]\n(\S+)", prompt).group(1)
+    return {"reasoning": f"copy {tok}", "same": tok}
+
+
+def test_thousands_of_concurrent_calls_stay_isolated():
+    lm = StandInLM(_respond)
+    tokens = [f"t{i}" for i in range(3000)]
+    mine = {}  # thread → (clone ids, tokens it sent)
+
+    def call(tok):
+        with dspy.context(lm=lm):
+            out = echo(tok)
+        mods, sent = mine.setdefault(threading.get_ident(), (set(), set()))
+        mods.add(id(echo._module()))
+        sent.add(tok)
+        return out
+
+    with ThreadPoolExecutor(32) as pool:
+        results = list(pool.map(call, tokens))
+
+    assert results == tokens
+    assert lm.calls == len(tokens)
+    assert all(len(mods) == 1 for mods, _ in mine.values())  # one clone per thread
+    # every clone's entries reach the shared module, trimmed like DSPy's own
+    shared = echo.module.history
+    assert len(shared) == min(len(tokens), dspy.settings.max_history_size)
+    assert len({id(e) for e in shared}) == len(shared)
+
+    def history_tokens(mod):
+        return {re.search(r"\[\[ ## token ## \]\]\n(\S+)", str(e["messages"])).group(1)
+                for e in mod.history}
+
+    with ThreadPoolExecutor(4) as pool:  # fresh threads must not see other threads' history
+        assert all(h == set() for h in pool.map(lambda _: history_tokens(echo._module()), range(4)))
+
+
+def test_module_history_collects_calls_from_thread_clones(capsys):
+    before = len(echo.module.history)
+    with dspy.context(lm=StandInLM(_respond)):
+        echo("first")
+        echo("second")
+    assert len(echo.module.history) == min(before + 2, dspy.settings.max_history_size)
+    assert "second" in str(echo.module.history[-1]["messages"])
+    echo.module.inspect_history()
+    assert "second" in capsys.readouterr().out
+
+
+def test_thread_clones_share_demos_and_follow_reassignment():
+    lm = StandInLM(_respond)
+    with dspy.context(lm=lm):
+        echo("warm")
+        clone = echo._module()
+        assert clone.predict.signature is echo.module.predict.signature
+        assert clone.predict.demos is echo.module.predict.demos
+
+        echo.module.predict.demos = [dspy.Example(token="demo-in", reasoning="r", same="demo-out")]
+        echo("again")
+    assert "demo-in" in str(lm.prompts[-1])
+    assert echo._module() is not clone
+    echo.module.predict.demos = []
+
+
+def test_optimiser_traces_see_the_real_module():
+    with dspy.context(trace=[]):
+        assert echo._module() is echo.module
+    assert echo._module() is not echo.module
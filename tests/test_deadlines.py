@@ -0,0 +1,66 @@
+"""Tests for per-call ``_timeout``, ``fd.deadline`` and batch deadlines."""
+
+import re
+import time
+
+import dspy
+import pytest
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def echo(text: str) -> str:
+    return said
+
+
+def _lm():
+    return StandInLM(lambda p: {"said": re.search(r"## text ## \]\]\n(\w+)", p).group(1)},
+                     delay=lambda p: 1.0 if "slow" in p else 0.0)
+
+
+def test_per_call_timeout_raises_promptly():
+    with dspy.context(lm=_lm()):
+        assert echo("quick", _timeout=5) == "quick"
+        start = time.perf_counter()
+        with pytest.raises(fd.DeadlineExceeded):
+            echo("slow", _timeout=0.1)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_deadline_propagates_and_fails_fast_once_passed():
+    lm = _lm()
+    with dspy.context(lm=lm), fd.deadline(0.2):
+        with pytest.raises(fd.DeadlineExceeded):
+            echo("slow")
+        calls = lm.calls
+        with pytest.raises(fd.DeadlineExceeded):
+            echo("quick")          # deadline already gone: never reaches the LM
+        with fd.deadline(10):      # an enclosing earlier deadline still wins
+            with pytest.raises(fd.DeadlineExceeded):
+                echo("quick")
+    assert lm.calls == calls
+
+
+def test_batch_deadline_returns_partial_results():
+    items = [{"text": w} for w in ["a", "slow", "b", "slowish", "c"]]
+    run = fd.parallelize(echo, timeout=0.4)
+    with dspy.context(lm=_lm()):
+        start = time.perf_counter()
+        out = run(items)
+    assert time.perf_counter() - start < 0.9
+    assert out[0::2] == ["a", "b", "c"]
+    assert out[1] == fd.TimedOut({"text": "slow"}) and not out[3]
+
+
+def test_stuck_calls_do_not_starve_later_deadline_calls():
+    with dspy.context(lm=_lm()):
+        with fd.deadline(0.1):
+            out = fd.parallel(echo, [{"text": "slow"}] * 80 + [{"text": "ok"}], concurrency=81)
+        assert out[-1] == "ok" and not any(out[:-1])          # enclosing deadline reached the batch
+        start = time.perf_counter()
+        assert echo("quick", _timeout=1.0) == "quick"          # 80 abandoned stragglers still asleep
+    assert time.perf_counter() - start < 0.5
+    lm = dspy.LM("openai/gpt-4o-mini")
+    assert fd._with_timeout(lm, 2.5).kwargs["timeout"] == 2.5 and "timeout" not in lm.kwargs
@@ -0,0 +1,32 @@
+"""Tests for structured output decoding (``_from_text``)."""
+
+import json
+
+import funnydspy as fd
+
+
+def test_nested_containers_parse_once_and_coerce():
+    assert fd._from_text("[[1, 2.5], [3]]", list[list[float]]) == [[1.0, 2.5], [3.0]]
+    assert fd._from_text('{"a": ["1", 2]}', dict[str, list[int]]) == {"a": [1, 2]}
+    assert fd._from_text("['x', 'y']", list[str]) == ["x", "y"]          # Python-literal fallback
+    assert fd._from_text("red, green", list[str]) == ["red", "green"]    # comma-separated
+
+
+def test_already_parsed_values_are_reused_in_place():
+    rows = json.loads(json.dumps([[0.5] * 3] * 4))
+    out = fd._from_text(rows, list[list[float]])
+    assert out is rows and all(r is o for r, o in zip(rows, out))
+    mixed = [1, 2.5]
+    assert fd._from_text(mixed, list[float]) is mixed and mixed == [1.0, 2.5]
+
+
+def test_failures_keep_raw_values():
+    assert fd._from_text("not json [", dict[str, int]) == "not json ["
+    assert fd._from_text("[1, x]", list[int]) == "[1, x]"            # not JSON at all
+    assert fd._from_text(["1", "two"], list[int]) == [1, "two"]
+    # per item, as before the single-parse rewrite: bad items stay, nothing is truncated
+    assert fd._from_text("1, 2, x", list[int]) == [1, 2, "x"]
+    assert fd._from_text("[1, 2, null]", list[int]) == [1, 2, None]
+    assert fd._from_text("[1.5, 2.7]", list[int]) == [1.5, 2.7]
+    assert not fd._type_ok([1, 2, "x"], list[int]) and fd._type_ok([1, 2], list[int])
+    assert fd._from_text(1.9, int) == 1.9 and fd._from_text(2.0, int) == 2
@@ -0,0 +1,88 @@
+"""Tests for ``fd.evaluate``."""
+
+import re
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def double(n: int) -> int:
+    return twice
+
+
+def _respond(prompt):
+    n = int(re.search(r"\[\[ ## n ## \]\]\n(-?\d+)", prompt).group(1))
+    return {"twice": str(2 * n if n != 3 else 0)}
+
+
+def _metric(ex, out):
+    return out == ex.twice
+
+
+DEVSET = [dspy.Example(n=i, twice=2 * i).with_inputs("n") for i in range(6)]
+
+
+def test_evaluate_returns_typed_outputs_and_latency():
+    lm = StandInLM(_respond)
+    with dspy.context(lm=lm):
+        res = fd.evaluate(double, DEVSET, _metric, threads=4, cache=False)
+    assert [r.output for r in res.rows] == [0, 2, 4, 0, 8, 10]
+    assert res.score == 5 / 6
+    assert all(r.latency >= 0 for r in res.rows)
+
+
+def test_evaluate_caches_per_program_state():
+    lm = StandInLM(_respond)
+    store = {}
+    with dspy.context(lm=lm):
+        fd.evaluate(double, DEVSET, _metric, cache=store)
+        again = fd.evaluate(double, DEVSET, _metric, cache=store)
+        assert lm.calls == len(DEVSET)
+        assert all(r.cached for r in again.rows)
+
+        double.module.demos = [dspy.Example(n=100, twice=200)]
+        try:
+            changed = fd.evaluate(double, DEVSET, _metric, cache=store)
+        finally:
+            double.module.demos = []
+    assert lm.calls == 2 * len(DEVSET)
+    assert not any(r.cached for r in changed.rows)
+
+
+def test_shared_cache_is_bounded_and_skips_sampled_outputs():
+    lm = StandInLM(_respond)
+    lm.kwargs["temperature"] = 0.8
+    with dspy.context(lm=lm):
+        fd.evaluate(double, DEVSET, _metric)
+        again = fd.evaluate(double, DEVSET, _metric)
+    assert lm.calls == 2 * len(DEVSET) and not any(r.cached for r in again.rows)
+    assert fd._EVAL_CACHE.maxsize == 10_000
+
+
+def test_evaluate_records_errors():
+    def boom(prompt):
+        raise RuntimeError("provider down")
+
+    with dspy.context(lm=StandInLM(boom)):
+        res = fd.evaluate(double, DEVSET[:2], _metric, cache=False)
+    assert res.score == 0.0
+    assert all(r.error is not None and r.output is None for r in res.rows)
+
+
+def test_demo_pool_is_part_of_the_cached_state():
+    lm = StandInLM(_respond)
+    store = {}
+    with dspy.context(lm=lm):
+        fd.evaluate(double, DEVSET, _metric, cache=store)
+        try:
+            double.use_demo_pool([{"n": 100, "twice": 200}], k=1)
+            pooled = fd.evaluate(double, DEVSET, _metric, cache=store)
+            double.use_demo_pool([{"n": 100, "twice": 200}], k=1)  # same contents: a new index hits
+            again = fd.evaluate(double, DEVSET, _metric, cache=store)
+        finally:
+            double.use_demo_pool(None)
+    assert not any(r.cached for r in pooled.rows) and all(r.cached for r in again.rows)
+    assert lm.calls == 2 * len(DEVSET)
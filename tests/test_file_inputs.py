@@ -0,0 +1,50 @@
+"""Tests for file-backed inputs (``Path``, ``mmap``, ``fd.FileSlice``)."""
+
+import mmap
+import re
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def first_word(text: str) -> str:
+    return word
+
+
+def _respond(prompt):
+    return {"word": re.search(r"\[\[ ## text ## \]\]\n(\S+)", prompt).group(1)}
+
+
+def test_path_mmap_and_slice_are_read_at_call(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("alpha beta\ngamma delta\n")
+    with dspy.context(lm=StandInLM(_respond)), open(doc, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert first_word(doc) == "alpha"
+        assert first_word(mm) == "alpha"
+        assert first_word(fd.FileSlice(doc, 11)) == "gamma"
+
+
+def test_split_on_line_breaks_and_parallel(tmp_path):
+    doc = tmp_path / "corpus.txt"
+    lines = [f"line{i} " + "x" * 30 for i in range(200)]
+    doc.write_text("\n".join(lines) + "\n")
+    slices = fd.FileSlice.split(doc, size=500)
+    assert len(slices) > 10
+    assert "".join(s.read() for s in slices) == doc.read_text()
+    assert all(s.read().endswith("\n") for s in slices)
+
+    with dspy.context(lm=StandInLM(_respond)):
+        out = fd.parallel(first_word, [{"text": s} for s in slices])
+    assert out == [s.read().split()[0] for s in slices]
+
+
+def test_cache_keys_follow_file_changes(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("one")
+    before = fd._inputs_hash({"text": doc})
+    doc.write_text("one two")
+    assert fd._inputs_hash({"text": doc}) != before
@@ -0,0 +1,49 @@
+"""Tests for ``fd.funnier`` wrappers."""
+
+from dataclasses import dataclass
+
+import dspy
+import pytest
+from dspy.utils import DummyLM
+
+import funnydspy as fd
+
+
+@dataclass
+class Stats:
+    mean: float
+    above: list[float]
+
+
+@fd.ChainOfThought
+def analyse(numbers: list[float], threshold: float) -> Stats:
+    """Compute stats."""
+    return Stats
+
+
+ANSWER = {"reasoning": "r", "Stats_mean": "2.0", "Stats_above": "[3.0]"}
+
+
+def test_optimised_copy_keeps_typed_return():
+    optimised = analyse.module.deepcopy()
+    optimised.predict.demos = [dspy.Example(numbers=[1], threshold=0, reasoning="r",
+                                            Stats_mean=1.0, Stats_above=[1.0])]
+    fast = fd.funnier(optimised)
+    with dspy.context(lm=DummyLM([ANSWER])):
+        out = fast([1.0, 2.0, 3.0], threshold=2.5)
+    assert out == Stats(mean=2.0, above=[3.0])
+
+
+def test_binder_is_compiled_and_checks_arguments():
+    fast = fd.funnier(analyse.module)
+    with pytest.raises(TypeError):
+        fast([1.0], 2.0, 3.0)
+    with pytest.raises(TypeError):
+        fast([1.0], numbers=[2.0])
+
+
+def test_bare_module_returns_dict_for_several_outputs():
+    fast = fd.funnier(dspy.Predict("question -> answer, confidence: float"))
+    with dspy.context(lm=DummyLM([{"answer": "Paris", "confidence": "0.9"}])):
+        out = fast("Capital of France?", unused="ignored")
+    assert out == {"answer": "Paris", "confidence": 0.9}
@@ -0,0 +1,55 @@
+"""Tests for hedged requests (``fd.Hedge``)."""
+
+import re
+import threading
+import time
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def echo(text: str) -> str:
+    return said
+
+
+def _lm(stall=2.0):
+    seen, lock = set(), threading.Lock()
+
+    def delay(prompt):
+        # the first request for a "slow" prompt stalls; its duplicate does not
+        with lock:
+            first = prompt not in seen
+            seen.add(prompt)
+        return stall if "slow" in prompt and first else 0.0
+
+    return StandInLM(lambda p: {"said": re.search(r"## text ## \]\]\n(\w+)", p).group(1)}, delay=delay)
+
+
+def test_slow_call_is_hedged_and_duplicate_wins():
+    policy = fd.Hedge(percentile=0.9, budget=0.5, min_samples=5, min_delay=0.05)
+    lm = _lm()
+    with dspy.context(lm=lm):
+        for i in range(6):
+            assert echo(f"fast{i}", _hedge=policy) == f"fast{i}"
+        start = time.perf_counter()
+        assert echo("slow", _hedge=policy) == "slow"
+        assert time.perf_counter() - start < 1.0
+    stats = policy.stats()
+    assert (stats["calls"], stats["hedged"], stats["hedge_wins"]) == (7, 1, 1)
+    assert stats["win_rate"] == 1.0
+
+
+def test_budget_caps_duplicates():
+    policy = fd.Hedge(budget=0.0, min_samples=3, min_delay=0.01)
+    echo.hedge = policy
+    try:
+        with dspy.context(lm=_lm(stall=0.2)):
+            for i in range(3):
+                echo(f"fast{i}")
+            assert echo("slowpoke") == "slowpoke"
+    finally:
+        echo.hedge = None
+    assert policy.stats()["calls"] == 4 and policy.stats()["hedged"] == 0
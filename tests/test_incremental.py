@@ -0,0 +1,79 @@
+"""Tests for ``fd.incremental`` dependency-tracked recomputation."""
+
+import re
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def gist(doc: str) -> str:
+    return summary
+
+
+@fd.Predict
+def combine(gists: list[str]) -> str:
+    return report
+
+
+def _respond(p):
+    if "## doc ##" in p:
+        doc = re.search(r"## doc ## \]\]\n(.+)", p).group(1)
+        return {"summary": doc.split()[0]}
+    return {"report": "report of " + re.search(r"## gists ## \]\]\n(.+)", p).group(1)}
+
+
+def _pipeline(docs):
+    return combine([gist(d) for d in docs])
+
+
+def test_only_changed_calls_and_their_dependants_rerun():
+    lm, store = StandInLM(_respond), {}
+    with dspy.context(lm=lm):
+        with fd.incremental(store) as run:
+            first = _pipeline(["alpha one", "beta two", "gamma three"])
+        assert run.stats() == {"reused": 0, "recomputed": 4}
+        with fd.incremental(store) as run:
+            again = _pipeline(["alpha one", "beta two", "gamma three"])
+        assert again == first and run.stats() == {"reused": 4, "recomputed": 0}
+        with fd.incremental(store) as run:
+            _pipeline(["alpha one", "delta two", "gamma three"])
+    assert run.stats() == {"reused": 2, "recomputed": 2}
+    assert lm.calls == 6
+
+
+def test_same_upstream_answer_keeps_downstream_cached():
+    lm, store = StandInLM(_respond), {}
+    with dspy.context(lm=lm), fd.incremental(store):
+        _pipeline(["alpha one", "beta two"])
+    with dspy.context(lm=lm), fd.incremental(store) as run:
+        _pipeline(["alpha changed", "beta two"])        # gist is still "alpha"
+    assert run.stats() == {"reused": 2, "recomputed": 1}
+
+
+def test_lineage_and_on_disk_store_with_prune(tmp_path):
+    path, lm = tmp_path / "store", StandInLM(_respond)
+    with dspy.context(lm=lm), fd.incremental(path) as run:
+        report = _pipeline(["alpha one", "beta two"])
+    steps = run.lineage(report)
+    assert [s.fn for s in steps] == ["GistSig", "GistSig", "CombineSig"]
+    assert set(steps[-1].parents) == {steps[0].key, steps[1].key}
+    with dspy.context(lm=lm), fd.incremental(path, prune=True) as run:
+        _pipeline(["alpha one"])
+    assert run.stats() == {"reused": 1, "recomputed": 1}
+    with dspy.context(lm=lm), fd.incremental(path) as run:
+        _pipeline(["alpha one", "beta two"])
+    assert run.stats() == {"reused": 1, "recomputed": 2}    # pruned entries are gone
+
+
+def test_parallel_batches_inside_incremental_are_recorded():
+    lm, store = StandInLM(_respond), {}
+    rows = [{"doc": d} for d in ["alpha one", "beta two", "gamma three"]]
+    with dspy.context(lm=lm), fd.incremental(store) as run:
+        assert fd.parallel(gist, rows) == ["alpha", "beta", "gamma"]
+    assert run.stats() == {"reused": 0, "recomputed": 3} and len(store) == 3
+    with dspy.context(lm=lm), fd.incremental(store) as run:
+        assert fd.parallel(gist, rows) == ["alpha", "beta", "gamma"]
+    assert run.stats() == {"reused": 3, "recomputed": 0} and lm.calls == 3
@@ -0,0 +1,38 @@
+"""Tests for ``fd.DemoIndex`` and per-call kNN demo selection."""
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+POOL = [
+    dspy.Example(text="the striker scored a late goal in the football final", topic="sport"),
+    dspy.Example(text="parliament passed the budget bill after a long debate", topic="politics"),
+    dspy.Example(text="the new GPU doubles training throughput for neural networks", topic="tech"),
+    dspy.Example(text="the goalkeeper saved a penalty in extra time", topic="sport"),
+]
+
+
+@fd.Predict
+def topic_of(text: str) -> str:
+    return topic
+
+
+def test_bm25_ranks_the_most_similar_demos_first():
+    index = fd.DemoIndex(POOL, ["text"])
+    assert [d.topic for d in index.query({"text": "a penalty goal in the final"}, k=2)] == ["sport", "sport"]
+    assert index.query("budget debate", k=1)[0].topic == "politics"
+    assert index.query("zzz unknown words", k=3) == []
+
+
+def test_calls_attach_only_the_top_k_demos():
+    lm = StandInLM(lambda p: {"topic": "tech"})
+    topic_of.use_demo_pool(POOL, k=1)
+    try:
+        with dspy.context(lm=lm):
+            topic_of("benchmarking neural networks on a GPU")
+    finally:
+        topic_of.use_demo_pool(None)
+    prompt = str(lm.prompts[0])
+    assert "doubles training throughput" in prompt
+    assert "goalkeeper" not in prompt and "parliament" not in prompt
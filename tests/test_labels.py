@@ -0,0 +1,81 @@
+"""Tests for lenient ``Literal``/``Enum`` output parsing."""
+
+import enum
+import re
+from typing import Literal
+
+import dspy
+import pytest
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+class Priority(enum.Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+@fd.Predict
+def sentiment(text: str) -> Literal["positive", "negative", "mixed feelings"]:
+    return label
+
+
+@fd.Predict
+def priority(ticket: str) -> Priority:
+    return level
+
+
+def _echo(field, inp):
+    return lambda p: {field: re.search(rf"## {inp} ## \]\]\n(.+)", p).group(1)}
+
+
+def test_near_misses_map_to_labels_and_are_counted():
+    answers = ["Positive.", "positve", "It is NEGATIVE overall", "Mixed-Feelings", "negative"]
+    with dspy.context(lm=StandInLM(_echo("label", "text"))):
+        out = fd.parallel(sentiment, [{"text": a} for a in answers])
+    assert out == ["positive", "positive", "negative", "mixed feelings", "negative"]
+    stats = sentiment.label_stats()["label"]
+    assert stats["exact"] >= 1 and stats["normalised"] >= 2
+    assert stats["fuzzy"] >= 1 and stats["contained"] >= 1
+
+
+def test_enum_names_and_values_both_match():
+    with dspy.context(lm=StandInLM(_echo("level", "ticket"))):
+        assert priority("HIGH") is Priority.HIGH
+        assert priority("Low!") is Priority.LOW
+
+
+def test_answers_far_from_every_label_still_fail():
+    with dspy.context(lm=StandInLM(lambda p: {"label": "banana"})):
+        with pytest.raises(Exception):
+            sentiment("x")
+
+
+def test_negated_answers_are_not_mapped_and_counts_are_per_program():
+    @fd.Predict
+    def other(text: str) -> Literal["positive", "negative", "mixed feelings"]:
+        return label
+
+    before = other.label_stats()["label"]
+    for answer in ["not positive", "It's not Positive.", "isn't negative"]:
+        with dspy.context(lm=StandInLM(lambda p: {"label": answer})):
+            with pytest.raises(Exception):
+                sentiment("x")
+    with dspy.context(lm=StandInLM(lambda p: {"label": "Positive!"})):
+        assert sentiment("x") == "positive"
+    assert sentiment.label_stats()["label"]["miss"] >= 3
+    assert other.label_stats()["label"] == before == dict.fromkeys(before, 0)
+
+
+def test_funnier_load_and_stream_map_near_misses(tmp_path):
+    from dspy.utils import DummyLM
+
+    wrapped = fd.funnier(sentiment.module)
+    fd.save(sentiment, tmp_path / "sentiment.json")
+    loaded = fd.load(tmp_path / "sentiment.json")
+    with dspy.context(lm=StandInLM(lambda p: {"label": "Positive."})):
+        assert wrapped("x") == "positive"
+        assert loaded("x") == "positive"
+    with dspy.context(lm=DummyLM([{"label": "Negative."}])):
+        assert list(sentiment.stream("x"))[-1] == "negative"
@@ -0,0 +1,45 @@
+"""Tests for ``fd.lazy`` / ``fd.gather``."""
+
+import re
+import time
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def shout(text: str) -> str:
+    return loud
+
+
+@fd.Predict
+def join(parts: list[str]) -> str:
+    return joined
+
+
+def _respond(prompt):
+    if "[[ ## parts ## ]]" in prompt:
+        return {"joined": "+".join(re.findall(r'"(\w+)"', prompt))}
+    return {"loud": re.search(r"\[\[ ## text ## \]\]\n(\w+)", prompt).group(1).upper()}
+
+
+def test_independent_calls_overlap():
+    lm = StandInLM(_respond, delay=0.2)
+    start = time.perf_counter()
+    with dspy.context(lm=lm), fd.lazy(max_workers=4):
+        outs = [shout(w) for w in ("a", "b", "c", "d")]
+        assert all(isinstance(o, fd.Lazy) for o in outs)
+    assert fd.gather(outs) == ["A", "B", "C", "D"]
+    assert time.perf_counter() - start < 0.6
+
+
+def test_futures_feed_dependent_calls():
+    lm = StandInLM(_respond)
+    with dspy.context(lm=lm), fd.lazy():
+        parts = [shout("x"), shout("y")]
+        joined = join(parts)
+        assert joined == "X+Y"
+    assert str(joined) == "X+Y"
+    assert lm.calls == 3
@@ -0,0 +1,45 @@
+"""Tests for ``fd.LMPool`` (load balancing parallel batches over endpoints)."""
+
+import re
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def echo(text: str) -> str:
+    return said
+
+
+def _said(p):
+    return {"said": re.search(r"## text ## \]\]\n(\w+)", p).group(1)}
+
+
+def _down(p):
+    raise dspy.lm15.ServerError("replica down", status=503)
+
+
+def test_items_spread_over_endpoints_within_limits():
+    a = StandInLM(_said, delay=0.02, model="a")
+    b = StandInLM(_said, delay=0.02, model="b")
+    pool = fd.LMPool().add(a, limit=3).add(b, limit=3)
+    out = fd.parallel(echo, [{"text": f"w{i}"} for i in range(30)], lms=pool)
+    assert out == [f"w{i}" for i in range(30)]
+    stats = {s["lm"]: s for s in pool.stats()}
+    assert a.calls > 5 and b.calls > 5 and a.calls + b.calls == 30
+    assert stats["a"]["peak"] <= 3 and stats["b"]["peak"] <= 3
+    assert all(s["outstanding"] == 0 for s in stats.values())
+
+
+def test_failing_endpoint_is_ejected_and_requests_retried():
+    good = StandInLM(_said, model="good")
+    bad = StandInLM(_down, model="bad")
+    bad.num_retries = 0                          # fail over now rather than back off in place
+    pool = fd.LMPool([bad, good], eject_after=2, cooldown=60)
+    out = fd.parallel(echo, [{"text": f"w{i}"} for i in range(20)], lms=pool, concurrency=1)
+    assert out == [f"w{i}" for i in range(20)]
+    stats = {s["lm"]: s for s in pool.stats()}
+    assert stats["bad"]["ejected"] and stats["bad"]["failures"] == 2
+    assert stats["good"]["requests"] == 20
@@ -0,0 +1,83 @@
+"""Tests for ndarray outputs and ``fd.parallel(..., as_columns=True)``."""
+
+import re
+from dataclasses import dataclass
+
+import dspy
+import pytest
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+np = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+
+@fd.Predict
+def embed(text: str) -> npt.NDArray[np.float32]:
+    return vector
+
+
+@fd.Predict
+def grid(text: str) -> np.ndarray[tuple[int, int], np.dtype[np.int64]]:
+    return cells
+
+
+@dataclass
+class Score:
+    value: float
+    votes: int
+    label: str
+
+
+@fd.Predict
+def score(text: str) -> Score:
+    return Score
+
+
+def test_ndarray_outputs_are_requested_as_lists_and_decoded():
+    assert embed.signature.output_fields["vector"].annotation == list[float]
+    assert grid.signature.output_fields["cells"].annotation == list[list[int]]
+    with dspy.context(lm=StandInLM(lambda p: {"vector": [0.5, 1.5], "cells": [[1, 2], [3, 4]]})):
+        vec, cells = embed("x"), grid("x")
+    assert vec.dtype == np.float32 and vec.tolist() == [0.5, 1.5]
+    assert cells.dtype == np.int64 and cells.shape == (2, 2)
+
+
+def test_parallel_as_columns_fills_one_array_per_numeric_field():
+    def respond(p):
+        n = int(re.search(r"## text ## \]\]\n(\d+)", p).group(1))
+        return {"Score_value": n / 2, "Score_votes": n, "Score_label": f"l{n}"}
+
+    with dspy.context(lm=StandInLM(respond)):
+        cols = fd.parallel(score, [{"text": str(i)} for i in range(6)], as_columns=True)
+    assert cols["value"].dtype == np.float64 and cols["value"].tolist() == [0, 0.5, 1, 1.5, 2, 2.5]
+    assert cols["votes"].dtype == np.int64 and cols["votes"].sum() == 15
+    assert cols["label"] == [f"l{i}" for i in range(6)] and cols.ok.all()
+
+
+def test_ndarray_type_survives_save_and_load(tmp_path):
+    fd.save(embed, tmp_path / "embed.json")
+    loaded = fd.load(tmp_path / "embed.json")
+    with dspy.context(lm=StandInLM(lambda p: {"vector": [1.0]})):
+        assert loaded("x").dtype == np.float32
+
+
+def test_columns_flag_rows_that_do_not_decode_and_strip_model_prefixes():
+    import pydantic
+
+    class Rating(pydantic.BaseModel):
+        value: float
+        votes: int
+
+    plan = fd._ReturnPlan(score.signature, Score)
+    preds = [dspy.Prediction(Score_value=1.0, Score_votes=v, Score_label="x") for v in (3, 3.7, "many")]
+    cols = fd._columns(plan, preds)
+    assert cols.ok.tolist() == [True, False, False] and cols["votes"][0] == 3
+
+    @fd.Predict
+    def rate(text: str) -> Rating:
+        return Rating
+
+    preds = [dspy.Prediction(Rating_value=0.5, Rating_votes=2)]
+    assert sorted(fd._columns(rate.module._funky_plan, preds)) == ["value", "votes"]
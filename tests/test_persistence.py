@@ -0,0 +1,79 @@
+"""Tests for ``fd.save`` / ``fd.load`` / ``fd.load_dir``."""
+
+import json
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+import dspy
+import pytest
+from dspy.utils import DummyLM
+
+import funnydspy as fd
+
+
+@dataclass
+class Stats:
+    mean: float
+    above: list[float]
+
+
+@fd.ChainOfThought
+def analyse(numbers: list[float], threshold: Optional[float]) -> Stats:
+    """Compute stats."""
+    return Stats
+
+
+ANSWER = {"reasoning": "r", "Stats_mean": "2.0", "Stats_above": "[3.0]"}
+
+
+def test_roundtrip_keeps_demos_instructions_and_return_type(tmp_path):
+    optimised = analyse.module.deepcopy()
+    optimised.predict.demos = [dspy.Example(numbers=[1.0], threshold=0.0, reasoning="r",
+                                            Stats_mean=1.0, Stats_above=[1.0])]
+    fd.save(fd.funnier(optimised), tmp_path / "analyse.json")
+
+    loaded = fd.load(tmp_path / "analyse.json")
+    assert loaded.name == "analyse"
+    assert loaded.module.predict.demos[0]["Stats_mean"] == 1.0
+    assert loaded.signature.instructions == analyse.signature.instructions
+    with dspy.context(lm=DummyLM([ANSWER])):
+        assert loaded([1.0, 2.0, 3.0], 2.5) == Stats(mean=2.0, above=[3.0])
+
+
+def test_local_return_types_are_rebuilt_structurally(tmp_path):
+    @dataclass
+    class Verdict:
+        label: Literal["spam", "ham"]
+        score: float
+
+    @fd.Predict
+    def judge(text: str) -> Verdict:
+        return Verdict
+
+    fd.save(judge, tmp_path / "judge.json")
+    loaded = fd.load(tmp_path / "judge.json")
+    with dspy.context(lm=DummyLM([{"Verdict_label": "spam", "Verdict_score": "0.9"}])):
+        out = loaded("buy now")
+    assert (out.label, out.score) == ("spam", 0.9)
+    assert type(out).__name__ == "Verdict"
+
+
+def test_unknown_format_version_is_refused(tmp_path):
+    path = tmp_path / "future.json"
+    fd.save(analyse, path)
+    data = json.loads(path.read_text())
+    data["funnydspy"] = 99
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="format 99"):
+        fd.load(path)
+
+
+def test_load_dir_is_lazy(tmp_path):
+    for i in range(3):
+        fd.save(analyse, tmp_path / f"prog{i}.json")
+    progs = fd.load_dir(tmp_path)
+    assert sorted(progs) == ["prog0", "prog1", "prog2"]
+    assert not any(p.loaded for p in progs.values())
+    with dspy.context(lm=DummyLM([ANSWER])):
+        assert progs["prog1"]([1.0], 0.5) == Stats(mean=2.0, above=[3.0])
+    assert [p.loaded for p in progs.values()] == [False, True, False]
@@ -0,0 +1,53 @@
+"""Tests for the pipe operator over single records and collections."""
+
+import re
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict
+def shout(text: str) -> str:
+    return loud
+
+
+@fd.Predict
+def whisper(loud: str) -> str:
+    return quiet
+
+
+def _respond(prompt):
+    if prompt.startswith("[[ ## loud ## ]]"):
+        return {"quiet": re.search(r"\[\[ ## loud ## \]\]\n(\w+)", prompt).group(1).lower() + "."}
+    return {"loud": re.search(r"\[\[ ## text ## \]\]\n(\w+)", prompt).group(1).upper()}
+
+
+def test_single_record_pipe():
+    with dspy.context(lm=StandInLM(_respond)):
+        out = {"text": "hi"} | shout | fd.predict
+    assert out.loud == "HI"
+
+
+def test_collection_pipe_chains_stages_in_order():
+    words = [f"w{i}" for i in range(20)]
+    with dspy.context(lm=StandInLM(_respond)):
+        out = list([{"text": w} for w in words] | shout | fd.predict | whisper | fd.predict)
+    assert [ex.quiet for ex in out] == [w + "." for w in words]
+
+
+def test_collection_pipe_streams_between_stages():
+    pulled = []
+
+    def records():
+        for i in range(200):
+            pulled.append(i)
+            yield (f"w{i}",)
+
+    with dspy.context(lm=StandInLM(_respond)):
+        stream = records() | shout | fd.predict | whisper | fd.predict
+        first = next(stream)
+        assert first.quiet == "w0."
+        assert len(pulled) < 200
+        stream.close()
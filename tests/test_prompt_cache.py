@@ -0,0 +1,55 @@
+"""Tests for the ``prefix_cache=True`` prompt layout."""
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+@fd.Predict(prefix_cache=True)
+def label(text: str) -> str:
+    """Label the text as spam or ham."""
+    return category
+
+
+USAGE = {"input_tokens": 100, "output_tokens": 2, "total_tokens": 102, "cache_read_tokens": 90}
+
+
+def _static(messages):
+    return messages[:-1]
+
+
+def test_static_prefix_is_byte_identical_and_inputs_come_last():
+    lm = StandInLM(lambda p: {"category": "ham"}, model="openai/gpt-4o-mini")
+    label.module.demos = [dspy.Example(text="win money", category="spam")]
+    try:
+        with dspy.context(lm=lm):
+            label("hello there")
+            label("see you tomorrow")
+    finally:
+        label.module.demos = []
+    first, second = lm.prompts
+    assert _static(first) == _static(second)
+    assert "hello there" in str(first[-1]) and "hello there" not in str(_static(first))
+    assert "cache_control" not in str(first)
+
+
+def test_cache_control_hint_for_anthropic_models():
+    lm = StandInLM(lambda p: {"category": "ham"}, model="anthropic/claude-sonnet")
+    with dspy.context(lm=lm):
+        label("hello")
+    (messages,) = lm.prompts
+    assert messages[-2]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert isinstance(messages[-1]["content"], str)
+
+
+def test_cache_hit_ratio_is_reported():
+    before = label.prompt_cache_stats()
+    lm = StandInLM(lambda p: {"category": "ham"}, usage=USAGE)
+    with dspy.context(lm=lm):
+        for _ in range(3):
+            assert label("hello") == "ham"
+    after = label.prompt_cache_stats()
+    assert after["calls"] - before["calls"] == 3
+    assert after["cached_tokens"] - before["cached_tokens"] == 270
+    assert after["prompt_tokens"] - before["prompt_tokens"] == 300
@@ -0,0 +1,67 @@
+"""Tests for pydantic ``BaseModel`` return types."""
+
+import dspy
+import pytest
+from dspy.utils.exceptions import AdapterParseError
+from pydantic import BaseModel, Field
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+
+class Address(BaseModel):
+    city: str
+    zip: str
+
+
+class Person(BaseModel):
+    name: str = Field(description="Full name")
+    age: int = Field(description="Age in years")
+    addresses: list[Address] = Field(description="Known addresses")
+
+
+@fd.Predict
+def extract(text: str) -> Person:
+    return Person
+
+
+def test_model_fields_become_outputs_and_decode_nested():
+    fields = extract.signature.output_fields
+    assert list(fields) == ["Person_name", "Person_age", "Person_addresses"]
+    assert fields["Person_age"].json_schema_extra["desc"] == "Age in years"
+    answer = {"Person_name": "Ada", "Person_age": "36",
+              "Person_addresses": '```json\n[{"city": "London", "zip": "N1",}]\n```'}
+    with dspy.context(lm=StandInLM(lambda p: answer)):
+        person = extract("Ada, 36, lives in London N1")
+    assert isinstance(person, Person)
+    assert person.age == 36 and person.addresses == [Address(city="London", zip="N1")]
+
+
+def test_invalid_nested_output_fails_instead_of_returning_text():
+    answer = {"Person_name": "Ada", "Person_age": 36, "Person_addresses": '[{"city": "London"}]'}
+    with dspy.context(lm=StandInLM(lambda p: answer)):
+        with pytest.raises(AdapterParseError):
+            extract("Ada")
+
+
+def test_local_model_round_trips_through_save(tmp_path):
+    class Point(BaseModel):
+        x: float = Field(description="Horizontal")
+        y: float
+
+    @fd.Predict
+    def locate(text: str) -> Point:
+        return Point
+
+    fd.save(locate, tmp_path / "locate.json")
+    loaded = fd.load(tmp_path / "locate.json")
+    assert loaded.signature.output_fields["Point_x"].json_schema_extra["desc"] == "Horizontal"
+    with dspy.context(lm=StandInLM(lambda p: {"Point_x": 1.5, "Point_y": "2"})):
+        point = loaded("origin")
+    assert (point.x, point.y) == (1.5, 2.0) and type(point).__name__ == "Point"
+
+
+def test_generic_aliases_are_not_mistaken_for_models():
+    # on 3.10 ``isinstance(list[float], type)`` is True and ``issubclass`` on it raises
+    assert not fd._is_model(list[float]) and not fd._has_model(dict[str, list[int]])
+    assert fd._has_model(list[Address]) and fd._is_model(Person)
@@ -0,0 +1,86 @@
+"""Tests for ``fd.ReAct`` tools: descriptions, concurrent calls and memoisation."""
+
+import threading
+import time
+
+import dspy
+
+import funnydspy as fd
+from tests.conftest import StandInLM
+
+seen = []
+
+
+def lookup(city: str,  # city to look up
+           ) -> str:
+    "Current weather in a city."
+    seen.append(city)
+    time.sleep(0.2)
+    return f"sunny in {city}"
+
+
+population_calls = []
+
+
+@fd.tool(cache=True)
+def population(city: str) -> int:
+    "Number of inhabitants of a city."
+    population_calls.append(city)
+    return len(city) * 1000
+
+
+@fd.ReAct(tools=[lookup, population], max_iters=4)
+def travel(question: str) -> str:
+    return answer
+
+
+def _agent(first_step):
+    def respond(p):
+        if "next_thought" not in p:
+            return {"reasoning": "done", "answer": "pack sunglasses"}
+        if "observation_0" not in p:
+            return {"next_thought": "look both up", **first_step}
+        return {"next_thought": "enough", "next_tool_name": "finish", "next_tool_args": {}}
+    return respond
+
+
+def test_tools_are_described_from_docstrings_and_docments():
+    tools = travel.module.tools
+    assert set(tools) == {"lookup", "population", "run_parallel", "finish"}
+    assert tools["lookup"].desc == "Current weather in a city."
+    assert tools["lookup"].args["city"]["description"] == "city to look up"
+
+
+def test_run_parallel_executes_independent_calls_concurrently():
+    seen.clear()
+    step = {"next_tool_name": "run_parallel",
+            "next_tool_args": {"calls": [{"tool_name": "lookup", "args": {"city": "Oslo"}},
+                                         {"tool_name": "lookup", "args": {"city": "Rome"}},
+                                         {"tool_name": "lookup", "args": {"city": "Lima"}}]}}
+    with dspy.context(lm=StandInLM(_agent(step))):
+        start = time.perf_counter()
+        pred = travel("Where is it sunny?", _prediction=True)
+        elapsed = time.perf_counter() - start
+    assert pred.answer == "pack sunglasses"
+    assert sorted(seen) == ["Lima", "Oslo", "Rome"]
+    assert pred.trajectory["observation_0"] == ["sunny in Oslo", "sunny in Rome", "sunny in Lima"]
+    assert elapsed < 0.5
+
+
+def test_cached_tools_run_once_per_argument():
+    population_calls.clear()
+    step = {"next_tool_name": "population", "next_tool_args": {"city": "Paris"}}
+    with dspy.context(lm=StandInLM(_agent(step))):
+        for _ in range(3):
+            assert travel("How big is Paris?") == "pack sunglasses"
+    assert population_calls == ["Paris"]
+
+
+def test_tools_and_max_iters_join_the_memo_key():
+    def make(n):
+        @fd.ReAct(tools=[lookup], max_iters=n)
+        def ask(question: str) -> str:
+            return answer
+        return ask
+    assert make(3) is make(3)
+    assert make(3) is not make(5) and make(5).module.max_iters == 5
@@ -0,0 +1,52 @@
+"""Tests for ``fd.registry`` and ``fd.warmup``."""
+
+import gc
+
+import dspy
+
+import funnydspy as fd
+
+
+def test_funky_and_funnier_products_are_registered():
+    @fd.Predict
+    def registered_fn(text: str) -> str:
+        return label
+
+    assert registered_fn in fd.registry
+    assert fd.registry.get("registered_fn") is registered_fn
+    wrapped = fd.funnier(registered_fn.module, alias="wrapped_fn")
+    assert "wrapped_fn" in fd.registry.names()
+
+
+def test_registry_does_not_keep_programs_alive():
+    before = len(fd.registry)
+    wrapped = fd.funnier(dspy.Predict("a -> b"))
+    assert len(fd.registry) == before + 1
+    del wrapped
+    gc.collect()
+    assert len(fd.registry) == before
+
+
+def test_background_warmup_materialises_lazy_programs(tmp_path):
+    @fd.Predict
+    def saved_fn(text: str) -> str:
+        return label
+
+    for i in range(4):
+        fd.save(saved_fn, tmp_path / f"p{i}.json")
+    progs = fd.load_dir(tmp_path)
+    fut = fd.warmup(progs.values(), in_background=True)
+    assert len(fut.result(timeout=10)) == 4
+    assert all(p.loaded for p in progs.values())
+    assert all(p in fd.registry for p in progs.values())
+    assert not any(p.materialise() in fd.registry for p in progs.values())  # no duplicates
+
+
+def test_eagerly_loaded_programs_are_registered(tmp_path):
+    @fd.Predict
+    def kept_fn(text: str) -> str:
+        return label
+
+    fd.save(kept_fn, tmp_path / "kept.json")
+    loaded = fd.load(tmp_path / "kept.json")
+    assert loaded in fd.registry and fd.registry.get("kept") is loaded
@@ -0,0 +1,41 @@
+"""Tests for ``fn.stream`` / ``fn.astream``."""
+
+import asyncio
+from dataclasses import dataclass
+
+import dspy
+from dspy.streaming import StreamResponse
+from dspy.utils import DummyLM
+
+import funnydspy as fd
+
+
+@dataclass
+class Verdict:
+    label: str
+    score: float
+
+
+@fd.ChainOfThought
+def judge(text: str) -> Verdict:
+    """Judge the text."""
+    return Verdict
+
+
+def test_stream_ends_with_typed_value():
+    answers = [{"reasoning": "looks fine", "Verdict_label": "ok", "Verdict_score": "0.5"}]
+    with dspy.context(lm=DummyLM(answers)):
+        events = list(judge.stream("hello"))
+    assert events[-1] == Verdict(label="ok", score=0.5)
+    assert all(isinstance(ev, StreamResponse) for ev in events[:-1])
+
+
+def test_astream_ends_with_typed_value():
+    answers = [{"reasoning": "looks fine", "Verdict_label": "ok", "Verdict_score": "0.5"}]
+
+    async def collect():
+        return [ev async for ev in judge.astream(text="hello")]
+
+    with dspy.context(lm=DummyLM(answers)):
+        events = asyncio.run(collect())
+    assert events[-1] == Verdict(label="ok", score=0.5)
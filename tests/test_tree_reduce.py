@@ -0,0 +1,80 @@
+"""Tests for ``fd.tree_reduce`` (hierarchical map-reduce with node caching)."""
+
+import threading
+
+import pytest
+
+import funnydspy as fd
+
+
+def counting(fn):
+    lock = threading.Lock()
+
+    def step(x):
+        with lock:
+            step.calls.append(x)
+        return fn(x)
+    step.calls = []
+    return step
+
+
+def test_reduces_level_by_level_in_order():
+    upper = counting(str.upper)
+    join = counting(lambda parts: "+".join(parts))
+    out = fd.tree_reduce(upper, join, list("abcdefg"), fanout=3, cache=False)
+    assert out == "A+B+C+D+E+F+G"
+    # 7 leaves -> 3 groups (3, 3, 1 carried up) -> 1 root: 2 + 1 reduce calls
+    assert len(upper.calls) == 7 and len(join.calls) == 3
+
+
+def test_small_edit_recomputes_only_affected_branch():
+    store = {}
+    upper = counting(str.upper)
+    join = counting(lambda parts: "".join(parts))
+    chunks = [f"chunk{i}." for i in range(16)]
+    fd.tree_reduce(upper, join, chunks, fanout=4, cache=store)
+    upper.calls.clear(), join.calls.clear()
+
+    chunks[5] = "edited."
+    out = fd.tree_reduce(upper, join, chunks, fanout=4, cache=store)
+    assert "EDITED." in out
+    assert upper.calls == ["edited."]
+    assert len(join.calls) == 2                  # the edited leaf's parent and the root
+
+
+def test_long_string_is_split_under_budget():
+    text = "\n\n".join("word " * 50 for _ in range(10))    # ~63 tokens per paragraph
+    sizes = []
+    fd.tree_reduce(lambda c: sizes.append(len(c)) or 1, sum, text, token_budget=150, cache=False)
+    assert len(sizes) == 5 and max(sizes) <= 600     # two paragraphs per chunk
+    with pytest.raises(ValueError):
+        fd.tree_reduce(str, sum, [], cache=False)
+
+
+def test_plain_functions_do_not_share_nodes_by_name():
+    store = {}
+    assert fd.tree_reduce(lambda c: c.upper(), "".join, ["ab", "cd"], cache=store) == "ABCD"
+    assert fd.tree_reduce(lambda c: c[::-1], "".join, ["ab", "cd"], cache=store) == "badc"
+    assert fd.tree_reduce(lambda c: c[::-1], "".join, ["ab", "cd"]) == "badc"
+
+
+@fd.Predict
+def tag(chunk: str) -> str:
+    return label
+
+
+def test_nodes_are_keyed_by_the_lm_in_effect():
+    import dspy
+    from tests.conftest import StandInLM
+
+    lm_a, lm_b = StandInLM(lambda p: {"label": "A"}), StandInLM(lambda p: {"label": "B"}, model="other")
+    store = {}
+    for cache in (store, True):
+        with dspy.context(lm=lm_a):
+            assert fd.tree_reduce(lambda c: tag(c), "".join, ["x", "y"], cache=cache) == "AA"
+        with dspy.context(lm=lm_b):
+            assert fd.tree_reduce(lambda c: tag(c), "".join, ["x", "y"], cache=cache) == "BB"
+    assert lm_b.calls == 4
+    with dspy.context(lm=lm_a):                          # own dict: plain lambda cached per LM
+        fd.tree_reduce(lambda c: tag(c), "".join, ["x", "y"], cache=store)
+    assert lm_a.calls == 4